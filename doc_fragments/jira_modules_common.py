@@ -38,4 +38,24 @@ options:
         (set to `false` if you'd like to use self-signed certificates)
     default: true
     type: bool
+
+  concurrency:
+    required: false
+    description:
+      - The number of requests to run in parallel when a module issues
+        several independent requests to Jira.
+    default: 8
+    type: int
+
+  id_cache_ttl:
+    required: false
+    description:
+      - The number of seconds the name to ID maps of collections, such as
+        roles and project categories, are cached on the host running the
+        module and shared between tasks. Set to C(0) to disable the cache.
+      - The cache is kept in a directory of the temporary directory which
+        only the user running the module can access.
+      - Names missing from a cached map are always looked up again.
+    default: 60
+    type: int
 '''
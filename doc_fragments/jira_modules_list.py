@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+
+class ModuleDocFragment(object):
+    # Common documentation fragment for modules listing Jira resources
+    DOCUMENTATION = r'''
+options:
+  index_by:
+    required: false
+    description:
+      - Return the fact as a dict keyed by this attribute of each item
+        instead of a list, e.g. C(key), C(name) or C(id).
+      - Nested attributes can be given with dots, e.g. C(lead.name).
+      - The module fails if an item is missing the attribute or if the
+        attribute is not unique.
+'''
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+class ModuleDocFragment(object):
+    # Common documentation fragment for modules managing Jira resources
+    DOCUMENTATION = r'''
+options:
+  result_refresh:
+    required: false
+    description:
+      - How the resource returned after a create or update is obtained.
+      - C(full) reads the resource again from Jira.
+      - C(from_response) uses the resource returned by the write request
+        when Jira returns it, and reads it again otherwise.
+      - C(none) never reads the resource again. The result holds whatever
+        the write request returned, which may be incomplete or empty. Use
+        this when the result is not registered.
+    choices:
+      - full
+      - from_response
+      - none
+    default: full
+'''
@@ -2,7 +2,6 @@
 # -*- coding: utf-8 -*-
 
 from ansible.module_utils.jira_common import JiraModuleBase
-from ansible.module_utils.six.moves.urllib.parse import urlencode
 
 __metaclass__ = type
 
@@ -24,9 +23,18 @@ extends_documentation_fragment:
 
 options:
   group_name:
-    required: true
+    required: false
     description:
       - Query for a group by its name.
+      - This parameter is mutually exclusive with C(group_names).
+
+  group_names:
+    required: false
+    description:
+      - Query for several groups by their names at once.
+      - The groups are looked up concurrently.
+      - This parameter is mutually exclusive with C(group_name).
+    type: list
 
   include_inactive_users:
     required: false
@@ -38,10 +46,20 @@ options:
   max_results:
     required: false
     description:
-      - The max number of users to include in the result.
+      - The number of users to request per page.
+      - All pages are fetched. Once the first page reports the total
+        number of members, the remaining pages are fetched concurrently.
     type: int
     default: 50
 
+  names_only:
+    required: false
+    description:
+      - Return the members as a flat list of user names instead of full
+        user objects.
+    type: bool
+    default: false
+
 author: "Joe Topjian <joe@topjian.net>"
 """
 
@@ -55,10 +73,22 @@ ansible_facts:
       type: dict
       description:
         - A Jira group.
+        - C(values) holds every member of the group, or only their names
+          when C(names_only) is set.
         - See
           https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/group-getUsersFromGroup
           for the schema.
       returned: When a Jira group was detected.
+    jira_groups:
+      type: dict
+      description:
+        - The Jira groups that were found, keyed by name.
+      returned: When C(group_names) is set.
+    jira_groups_missing:
+      type: list
+      description:
+        - The requested group names that were not found.
+      returned: When C(group_names) is set.
 """
 
 EXAMPLES = """
@@ -68,6 +98,18 @@ EXAMPLES = """
     jira_username: '{{ user }}'
     jira_password: '{{ pass }}'
     group_name: 'jira-administrators'
+
+- name: Get the member names of a large group
+  jira_get_group_fact:
+    group_name: 'jira-software-users'
+    names_only: true
+
+- name: Get the members of several groups
+  jira_get_group_fact:
+    group_names:
+      - jira-administrators
+      - jira-software-users
+    names_only: true
 """
 
 REST_ENDPOINT = "rest/api/2/group/member"
@@ -78,9 +120,14 @@ class JiraGetGroup(JiraModuleBase):
 
     def __init__(self):
         self.module_args = dict(
-            group_name=dict(required=True, _jira_field='groupname'),
-            include_inactive_users=dict(_jira_field='includeInactiveUsers'),
-            max_results=dict(_jira_field='maxResults'),
+            group_name=dict(_jira_field='groupname'),
+            group_names=dict(type='list'),
+            include_inactive_users=dict(
+                type='bool',
+                default=False,
+                _jira_field='includeInactiveUsers'),
+            max_results=dict(type='int', default=50),
+            names_only=dict(type='bool', default=False),
         )
 
         self.results = dict(
@@ -93,23 +140,46 @@ class JiraGetGroup(JiraModuleBase):
         super(JiraGetGroup, self).__init__(
             derived_arg_spec=self.module_args,
             facts_module=True,
+            mutually_exclusive=[['group_name', 'group_names']],
+            required_one_of=[['group_name', 'group_names']],
             rest_endpoint=REST_ENDPOINT,
         )
 
-    def exec_module(self, **kwargs):
+    def get_group(self, name):
         query = {}
-
         for (field, jira_field) in self.jira_fields():
             v = self.param(field)
             if v is not None:
                 query[jira_field] = v
+        query['groupname'] = name
+
+        group = self.fetch_all_pages(
+            REST_ENDPOINT, query, self.param('max_results'))
+        if group is False:
+            return False
+
+        group['name'] = name
+        if self.param('names_only'):
+            group['values'] = [u['name'] for u in group['values']]
+        return group
+
+    def exec_module(self, **kwargs):
+        names = self.param('group_names')
+        if names is not None:
+            del(self.results['ansible_facts']['jira_group'])
+            try:
+                (groups, missing) = self.lookup_all(self.get_group, names)
+                self.results['ansible_facts']['jira_groups'] = groups
+                self.results['ansible_facts']['jira_groups_missing'] = missing
+            except Exception as e:
+                self.fail(msg=e.message)
+            return
 
         try:
-            group = self.get(urlencode(query))
+            group = self.get_group(self.param('group_name'))
             if group is False:
                 del(self.results['ansible_facts']['jira_group'])
             else:
-                group['name'] = self.param('group_name')
                 self.results['ansible_facts']['jira_group'] = group
         except Exception as e:
             self.fail(msg=e.message)
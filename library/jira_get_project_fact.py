@@ -27,13 +27,33 @@ options:
     required: false
     description:
       - Query for a project by its ID.
-      - This parameter is mutually exclusive with C(key).
+      - This parameter is mutually exclusive with C(key), C(ids) and
+        C(keys).
 
   key:
     required: false
     description:
       - Query for a project by its Jira Key.
-      - This parameter is mutually exclusive with C(id).
+      - This parameter is mutually exclusive with C(id), C(ids) and
+        C(keys).
+
+  ids:
+    required: false
+    description:
+      - Query for several projects by their IDs at once.
+      - The projects are looked up concurrently.
+      - This parameter is mutually exclusive with C(id), C(key) and
+        C(keys).
+    type: list
+
+  keys:
+    required: false
+    description:
+      - Query for several projects by their Jira Keys at once.
+      - The projects are looked up concurrently.
+      - This parameter is mutually exclusive with C(id), C(key) and
+        C(ids).
+    type: list
 
 author: "Joe Topjian <joe@topjian.net>"
 """
@@ -52,6 +72,17 @@ ansible_facts:
           https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/project-getProject
           for the schema.
       returned: When a Jira project was detected.
+    jira_projects:
+      type: dict
+      description:
+        - The Jira projects that were found, keyed by the requested ID or
+          key.
+      returned: When C(ids) or C(keys) is set.
+    jira_projects_missing:
+      type: list
+      description:
+        - The requested IDs or keys that were not found.
+      returned: When C(ids) or C(keys) is set.
 """
 
 EXAMPLES = """
@@ -61,6 +92,12 @@ EXAMPLES = """
     jira_username: '{{ user }}'
     jira_password: '{{ pass }}'
     key: 'PROJ'
+
+- name: Get several projects
+  jira_get_project_fact:
+    keys:
+      - PROJ
+      - PRJ1
 """
 
 REST_ENDPOINT = "rest/api/2/project"
@@ -73,6 +110,8 @@ class JiraGetProject(JiraModuleBase):
         self.module_args = dict(
             id=dict(),
             key=dict(),
+            ids=dict(type='list'),
+            keys=dict(type='list'),
         )
 
         self.results = dict(
@@ -85,27 +124,38 @@ class JiraGetProject(JiraModuleBase):
         super(JiraGetProject, self).__init__(
             derived_arg_spec=self.module_args,
             facts_module=True,
-            mutually_exclusive=[['id', 'key']],
-            required_one_of=[['id', 'key']],
+            mutually_exclusive=[['id', 'key', 'ids', 'keys']],
+            required_one_of=[['id', 'key', 'ids', 'keys']],
             rest_endpoint=REST_ENDPOINT,
         )
 
-    def exec_module(self, **kwargs):
-        v = self.param('id')
-        if v is not None:
-            self.rest_endpoint = "%s/%s" % (self.rest_endpoint, quote(v))
-
-        v = self.param('key')
-        if v is not None:
-            self.rest_endpoint = "%s/%s" % (self.rest_endpoint, quote(v))
-
+    def get_project(self, id_or_key):
         q = {
             'expand': ','.join(['description', 'lead', 'url', 'projectKeys'])
         }
-        query = urlencode(q)
+        endpoint = "%s/%s" % (REST_ENDPOINT, quote(str(id_or_key)))
+        return self.fetch(endpoint, urlencode(q))
+
+    def exec_module(self, **kwargs):
+        identifiers = self.param('ids') or self.param('keys')
+        if identifiers is not None:
+            del(self.results['ansible_facts']['jira_project'])
+            try:
+                (projects, missing) = self.lookup_all(
+                    self.get_project, identifiers)
+                self.results['ansible_facts']['jira_projects'] = projects
+                self.results['ansible_facts']['jira_projects_missing'] = \
+                    missing
+            except Exception as e:
+                self.fail(msg=e.message)
+            return
+
+        id_or_key = self.param('id')
+        if id_or_key is None:
+            id_or_key = self.param('key')
 
         try:
-            v = self.get(query)
+            v = self.get_project(id_or_key)
             if v is False:
                 del(self.results['ansible_facts']['jira_project'])
             else:
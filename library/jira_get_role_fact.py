@@ -26,13 +26,33 @@ options:
     required: false
     description:
       - Query for a role by its ID.
-      - This parameter is mutually exclusive with C(name).
+      - This parameter is mutually exclusive with C(name), C(ids) and
+        C(names).
 
   name:
     required: false
     description:
       - Query for a role by its name.
-      - This parameter is mutually exclusive with C(id).
+      - This parameter is mutually exclusive with C(id), C(ids) and
+        C(names).
+
+  ids:
+    required: false
+    description:
+      - Query for several roles by their IDs at once.
+      - All roles are read with a single request.
+      - This parameter is mutually exclusive with C(id), C(name) and
+        C(names).
+    type: list
+
+  names:
+    required: false
+    description:
+      - Query for several roles by their names at once.
+      - All roles are read with a single request.
+      - This parameter is mutually exclusive with C(id), C(name) and
+        C(ids).
+    type: list
 
 author: "Joe Topjian <joe@topjian.net>"
 """
@@ -51,12 +71,29 @@ ansible_facts:
           https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/role-getProjectRolesById
           for the schema.
       returned: When a Jira role was detected.
+    jira_roles:
+      type: dict
+      description:
+        - The Jira roles that were found, keyed by the requested ID or
+          name.
+      returned: When C(ids) or C(names) is set.
+    jira_roles_missing:
+      type: list
+      description:
+        - The requested IDs or names that were not found.
+      returned: When C(ids) or C(names) is set.
 """
 
 EXAMPLES = """
 - name: Get a role
   jira_get_role_fact:
     name: 'Administrators'
+
+- name: Get several roles
+  jira_get_role_fact:
+    names:
+      - 'Administrators'
+      - 'Developers'
 """
 
 REST_ENDPOINT = "rest/api/2/role"
@@ -69,6 +106,8 @@ class JiraGetRole(JiraModuleBase):
         self.module_args = dict(
             id=dict(),
             name=dict(),
+            ids=dict(type='list'),
+            names=dict(type='list'),
         )
 
         self.results = dict(
@@ -81,30 +120,50 @@ class JiraGetRole(JiraModuleBase):
         super(JiraGetRole, self).__init__(
             derived_arg_spec=self.module_args,
             facts_module=True,
-            mutually_exclusive=[['id', 'name']],
-            required_one_of=[['id', 'name']],
+            mutually_exclusive=[['id', 'name', 'ids', 'names']],
+            required_one_of=[['id', 'name', 'ids', 'names']],
             rest_endpoint=REST_ENDPOINT,
         )
 
-    def find_id(self):
+    def get_roles(self, field, identifiers):
         self.rest_endpoint = REST_ENDPOINT
-        roles = self.get()
-        name = self.param('name')
-        id = None
-        for role in roles:
-            if role["name"] == name:
-                id = role["id"]
-        return id
+        roles = {}
+        for role in self.get():
+            roles[str(role[field])] = role
 
-    def exec_module(self, **kwargs):
-        id = self.param('id')
-        if id is None:
-            id = self.find_id()
+        found = {}
+        missing = []
+        for i in identifiers:
+            if str(i) in roles:
+                found[i] = roles[str(i)]
+            elif i not in missing:
+                missing.append(i)
 
-        self.rest_endpoint = "%s/%s" % (self.rest_endpoint, id)
+        return (found, missing)
+
+    def exec_module(self, **kwargs):
+        for field in ['id', 'name']:
+            identifiers = self.param(field + 's')
+            if identifiers is None:
+                continue
+
+            del(self.results['ansible_facts']['jira_role'])
+            try:
+                (roles, missing) = self.get_roles(field, identifiers)
+                self.results['ansible_facts']['jira_roles'] = roles
+                self.results['ansible_facts']['jira_roles_missing'] = missing
+            except Exception as e:
+                self.fail(msg=e.message)
+            return
 
         try:
-            v = self.get()
+            id = self.param('id')
+            if id is None:
+                (id, v) = self.read_named(REST_ENDPOINT, self.param('name'))
+            else:
+                self.rest_endpoint = "%s/%s" % (REST_ENDPOINT, id)
+                v = self.get()
+
             if v is False:
                 del(self.results['ansible_facts']['jira_role'])
             else:
@@ -27,13 +27,33 @@ options:
     required: false
     description:
       - Query for a user by their username.
-      - This parameter is mutually exclusive with C(key).
+      - This parameter is mutually exclusive with C(key), C(usernames)
+        and C(keys).
 
   key:
     required: false
     description:
       - Query for a user by their Jira Key.
-      - This parameter is mutually exclusive with C(username).
+      - This parameter is mutually exclusive with C(username),
+        C(usernames) and C(keys).
+
+  usernames:
+    required: false
+    description:
+      - Query for several users by their usernames at once.
+      - The users are looked up concurrently.
+      - This parameter is mutually exclusive with C(username), C(key)
+        and C(keys).
+    type: list
+
+  keys:
+    required: false
+    description:
+      - Query for several users by their Jira Keys at once.
+      - The users are looked up concurrently.
+      - This parameter is mutually exclusive with C(username), C(key)
+        and C(usernames).
+    type: list
 
 author: "Joe Topjian <joe@topjian.net>"
 """
@@ -52,6 +72,17 @@ ansible_facts:
           https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/user-getUser
           for the schema.
       returned: When a Jira user was detected.
+    jira_users:
+      type: dict
+      description:
+        - The Jira users that were found, keyed by the requested username
+          or key.
+      returned: When C(usernames) or C(keys) is set.
+    jira_users_missing:
+      type: list
+      description:
+        - The requested usernames or keys that were not found.
+      returned: When C(usernames) or C(keys) is set.
 """
 
 EXAMPLES = """
@@ -61,6 +92,12 @@ EXAMPLES = """
     jira_username: '{{ user }}'
     jira_password: '{{ pass }}'
     username: 'admin'
+
+- name: Get several users
+  jira_get_user_fact:
+    usernames:
+      - admin
+      - jdoe
 """
 
 REST_ENDPOINT = "rest/api/2/user"
@@ -73,6 +110,8 @@ class JiraGetUser(JiraModuleBase):
         self.module_args = dict(
             username=dict(_jira_field='username'),
             key=dict(_jira_field='key'),
+            usernames=dict(type='list'),
+            keys=dict(type='list'),
         )
 
         self.results = dict(
@@ -85,22 +124,41 @@ class JiraGetUser(JiraModuleBase):
         super(JiraGetUser, self).__init__(
             derived_arg_spec=self.module_args,
             facts_module=True,
-            mutually_exclusive=[['username', 'key']],
-            required_one_of=[['username', 'key']],
+            mutually_exclusive=[['username', 'key', 'usernames', 'keys']],
+            required_one_of=[['username', 'key', 'usernames', 'keys']],
             rest_endpoint=REST_ENDPOINT,
         )
 
+    def get_user(self, query):
+        query = dict(query)
+        query['expand'] = ','.join(['groups', 'applicationRoles'])
+        return self.fetch(REST_ENDPOINT, urlencode(query))
+
     def exec_module(self, **kwargs):
+        for (field, jira_field) in [['usernames', 'username'],
+                                    ['keys', 'key']]:
+            identifiers = self.param(field)
+            if identifiers is None:
+                continue
+
+            del(self.results['ansible_facts']['jira_user'])
+            try:
+                (users, missing) = self.lookup_all(
+                    lambda i: self.get_user({jira_field: i}), identifiers)
+                self.results['ansible_facts']['jira_users'] = users
+                self.results['ansible_facts']['jira_users_missing'] = missing
+            except Exception as e:
+                self.fail(msg=e.message)
+            return
+
         query = {}
         for (field, jira_field) in self.jira_fields():
             v = self.param(field)
             if v is not None:
                 query[jira_field] = v
 
-        query['expand'] = ','.join(['groups', 'applicationRoles'])
-
         try:
-            v = self.get(urlencode(query))
+            v = self.get_user(query)
             if v is False:
                 del(self.results['ansible_facts']['jira_user'])
             else:
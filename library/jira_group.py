@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 from ansible.module_utils.jira_common import JiraModuleBase
+from ansible.module_utils.jira_resources import JiraGroups, GROUP_ARGS
 from ansible.module_utils.six.moves.urllib.parse import urlencode
 
 __metaclass__ = type
@@ -18,16 +19,43 @@ version_added: "0.0.1"
 short_description: manage a group in Jira
 description:
   - Manage a group in Jira
+  - Several groups can be managed in one task with C(groups).
 
 extends_documentation_fragment:
   - jira_modules_common
+  - jira_modules_write
 
 options:
   name:
-    required: true
+    required: false
     description:
       - The name of the group.
       - Cannot be updated.
+      - Required unless C(groups) is set.
+
+  state:
+    required: false
+    description:
+      - Whether the group should exist or not.
+    default: present
+    choices:
+      - absent
+      - present
+
+  groups:
+    required: false
+    type: list
+    description:
+      - A list of groups to manage. Each item is a dict taking the same
+        parameters as this module, except C(groups).
+      - Parameters missing from an item take their default value.
+      - The groups are listed once and diffed in memory. Only the changes
+        are applied, concurrently.
+      - When Jira truncates the listing, the listed groups it misses are
+        looked up individually, concurrently.
+      - Names are matched case insensitively, as Jira does. Existing
+        groups are reported under the name Jira holds them with.
+      - Cannot be used with C(name).
 
 author: "Joe Topjian <joe@topjian.net>"
 """
@@ -41,12 +69,33 @@ jira_group:
       https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/group-getUsersFromGroup
       for the schema.
   returned: When a Jira group was detected.
+
+jira_group_actions:
+  type: dict
+  description:
+    - Maps the name of every item of C(groups) to the action taken.
+  returned: When C(groups) is set.
+
+jira_group_errors:
+  type: dict
+  description:
+    - Maps the name of every item of C(groups) that could not be changed
+      to the error returned by Jira.
+  returned: When changes to some items of C(groups) failed.
 """
 
 EXAMPLES = """
 - name: Ensure group exists
   jira_group:
     name: group_1
+
+- name: Ensure several groups exist
+  jira_group:
+    groups:
+      - name: group_1
+      - name: group_2
+      - name: group_3
+        state: absent
 """
 
 REST_ENDPOINT_CREATE = "rest/api/2/group"
@@ -59,13 +108,12 @@ class JiraGroup(JiraModuleBase):
 
     def __init__(self):
         self.module_args = dict(
-            name=dict(required=True),
-            state=dict(
-                required=False,
-                default='present',
-                choices=['absent', 'present']),
+            GROUP_ARGS,
+            groups=dict(required=False, type='list'),
         )
 
+        self.resource = JiraGroups(self, GROUP_ARGS)
+
         self.results = dict(
             jira_group=dict(),
             changed=False,
@@ -73,10 +121,18 @@ class JiraGroup(JiraModuleBase):
 
         super(JiraGroup, self).__init__(
             derived_arg_spec=self.module_args,
+            write_module=True,
             rest_endpoint=REST_ENDPOINT_CREATE,
+            mutually_exclusive=[['groups', 'name']],
+            required_one_of=[['groups', 'name']],
         )
 
     def exec_module(self, **kwargs):
+        if self.param('groups') is not None:
+            self.exec_resource(
+                self.resource, self.param('groups'), 'groups', 'jira_group')
+            return
+
         action = None
         is_install_mode = self.param('state') == 'present'
 
@@ -118,10 +174,11 @@ class JiraGroup(JiraModuleBase):
                 }
 
                 self.rest_endpoint = REST_ENDPOINT_CREATE
-                self.post(data)
+                group = self.post(data)
 
                 self.rest_endpoint = REST_ENDPOINT_GET
-                group = self.get(query)
+                group = self.write_result(
+                    group, lambda: self.get(query), 'name')
                 self.results['jira_group'] = group
                 return
 
@@ -0,0 +1,365 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+import os
+
+from ansible.module_utils._text import to_text
+from ansible.module_utils.jira_common import JiraModuleBase, JiraModuleError
+from ansible.module_utils.jira_common import write_json
+
+__metaclass__ = type
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+
+DOCUMENTATION = """
+module: jira_group_membership_sync
+version_added: "0.0.1"
+short_description: sync group memberships in Jira from a file
+description:
+  - Sync the members of Jira groups from a CSV or JSONL file of group and
+    user pairs, such as an LDAP export.
+  - The file is read row by row. Each group of the file is then read
+    through all pages, diffed, and its changes applied concurrently,
+    one group at a time.
+  - Progress can be recorded in a checkpoint file, so an interrupted run
+    resumes with the groups it did not sync yet.
+  - Group names and usernames are compared case insensitively, as Jira
+    does. Members are removed under the name Jira holds them with.
+
+extends_documentation_fragment:
+  - jira_modules_common
+
+options:
+  src:
+    required: true
+    description:
+      - The path of the file holding the memberships.
+    type: path
+
+  format:
+    required: false
+    description:
+      - The format of C(src).
+      - With C(csv), the first row names the columns.
+      - With C(jsonl), every non-empty line is a JSON object.
+      - C(auto) picks the format from the extension of C(src), C(.jsonl)
+        and C(.json) meaning C(jsonl).
+    default: auto
+    choices:
+      - auto
+      - csv
+      - jsonl
+
+  group_field:
+    required: false
+    description:
+      - The column or key holding the group name.
+    default: group
+
+  user_field:
+    required: false
+    description:
+      - The column or key holding the username.
+    default: user
+
+  exclusive:
+    required: false
+    description:
+      - Remove the members of the groups of C(src) which are not listed
+        for them.
+      - Groups which are not in C(src) are never changed.
+    type: bool
+    default: true
+
+  checkpoint:
+    required: false
+    description:
+      - The path of a file recording the groups already synced.
+      - If the file exists, those groups are skipped.
+      - A checkpoint written for another version of C(src), as told by
+        its modification time and size, is rejected.
+      - The file is removed once every group was synced.
+    type: path
+
+author: "Joe Topjian <joe@topjian.net>"
+"""
+
+RETURN = """
+jira_group_membership_sync_groups:
+  type: int
+  description:
+    - The number of groups synced by this run.
+  returned: always
+
+jira_group_membership_sync_added:
+  type: int
+  description:
+    - The number of users added to groups.
+  returned: always
+
+jira_group_membership_sync_removed:
+  type: int
+  description:
+    - The number of users removed from groups.
+  returned: always
+
+jira_group_membership_sync_errors:
+  type: dict
+  description:
+    - Maps each group which could not be fully synced to the errors
+      reported by Jira.
+  returned: always
+
+jira_group_membership_sync_resumed:
+  type: bool
+  description:
+    - Whether the run resumed from C(checkpoint).
+  returned: always
+"""
+
+EXAMPLES = """
+- name: Mirror groups from an LDAP export
+  jira_group_membership_sync:
+    src: /var/tmp/ldap-groups.csv
+    checkpoint: /var/tmp/ldap-groups.checkpoint
+
+- name: Add memberships without removing any
+  jira_group_membership_sync:
+    src: /var/tmp/memberships.jsonl
+    group_field: groupname
+    user_field: username
+    exclusive: false
+"""
+
+
+def jsonl_records(f, src):
+    """Yield the JSON objects of the non-empty lines of f."""
+    for (n, line) in enumerate(f):
+        if not line.strip():
+            continue
+
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise JiraModuleError(
+                "Line %s of %s is not a JSON object" % (n + 1, src))
+        yield record
+
+
+class JiraGroupMembershipSync(JiraModuleBase):
+    """Utility class to sync Jira group memberships from a file"""
+
+    def __init__(self):
+        self.module_args = dict(
+            src=dict(required=True, type='path'),
+            format=dict(
+                required=False,
+                default='auto',
+                choices=['auto', 'csv', 'jsonl']),
+            group_field=dict(required=False, default='group'),
+            user_field=dict(required=False, default='user'),
+            exclusive=dict(required=False, type='bool', default=True),
+            checkpoint=dict(required=False, type='path'),
+        )
+
+        self.results = dict(
+            jira_group_membership_sync_groups=0,
+            jira_group_membership_sync_added=0,
+            jira_group_membership_sync_removed=0,
+            jira_group_membership_sync_errors=dict(),
+            jira_group_membership_sync_resumed=False,
+            changed=False,
+        )
+
+        super(JiraGroupMembershipSync, self).__init__(
+            derived_arg_spec=self.module_args,
+            rest_endpoint=None,
+            supports_check_mode=True,
+        )
+
+    def rows(self):
+        """Yield the (group, user) pairs of src, one row at a time."""
+        src = self.param('src')
+        fmt = self.param('format')
+        if fmt == 'auto':
+            fmt = 'csv'
+            if os.path.splitext(src)[1].lower() in ['.json', '.jsonl']:
+                fmt = 'jsonl'
+
+        group_field = self.param('group_field')
+        user_field = self.param('user_field')
+
+        with open(src) as f:
+            if fmt == 'csv':
+                records = csv.DictReader(f)
+            else:
+                records = jsonl_records(f, src)
+
+            for (n, record) in enumerate(records):
+                group = record.get(group_field)
+                user = record.get(user_field)
+                if not group or not user:
+                    raise JiraModuleError(
+                        "Record %s of %s lacks %s or %s" % (
+                            n + 1, src, group_field, user_field))
+                yield (to_text(group), to_text(user))
+
+    def read_src(self):
+        """Map each group of src to the set of its users.
+
+        Names repeat across many rows, so each distinct name is stored
+        once and shared between the sets. Jira names are case
+        insensitive, so names differing only by case are stored as the
+        first one read.
+        """
+        names = {}
+        group_names = {}
+        groups = {}
+        try:
+            for (group, user) in self.rows():
+                group = group_names.setdefault(group.lower(), group)
+                user = names.setdefault(user.lower(), user)
+                groups.setdefault(group, set()).add(user)
+        except (IOError, OSError, ValueError, csv.Error) as e:
+            raise JiraModuleError(
+                "Unable to read %s: %s" % (self.param('src'), e))
+
+        return groups
+
+    def run_id(self):
+        # A new export written to the same path is a different run.
+        st = os.stat(self.param('src'))
+        return dict(
+            src=self.param('src'),
+            mtime=st.st_mtime,
+            size=st.st_size,
+            exclusive=self.param('exclusive'),
+        )
+
+    def read_checkpoint(self):
+        path = self.param('checkpoint')
+        if path is None or not os.path.exists(path):
+            return None
+
+        try:
+            with open(path) as f:
+                checkpoint = json.load(f)
+        except (IOError, OSError, ValueError) as e:
+            raise JiraModuleError(
+                "Unable to read checkpoint %s: %s" % (path, e))
+
+        if checkpoint.get('run') != self.run_id():
+            raise JiraModuleError(
+                "Checkpoint %s was written by a different run, remove it "
+                "to start over" % (path))
+
+        return checkpoint
+
+    def write_checkpoint(self, done):
+        path = self.param('checkpoint')
+        if path is None:
+            return
+
+        try:
+            write_json(path, dict(run=self.run_id(), done=sorted(done)))
+        except (IOError, OSError) as e:
+            raise JiraModuleError(
+                "Unable to write checkpoint %s: %s" % (path, e))
+
+    def change(self, change):
+        (add, group, user) = change
+        try:
+            if add:
+                self.add_group_member(group, user)
+            else:
+                self.remove_group_member(group, user)
+        except JiraModuleError as e:
+            return e.message
+        return None
+
+    def sync_group(self, group, users):
+        """Sync one group, returning the errors of its changes."""
+        try:
+            members = self.group_members(group)
+        except JiraModuleError as e:
+            return [e.message]
+
+        # Jira usernames are case insensitive.
+        members = dict((m.lower(), m) for m in members)
+        wanted = set([u.lower() for u in users])
+
+        added = [u for u in users if u.lower() not in members]
+        removed = []
+        if self.param('exclusive'):
+            removed = [m for (k, m) in members.items() if k not in wanted]
+
+        changes = [(True, group, u) for u in sorted(added)] + \
+            [(False, group, u) for u in sorted(removed)]
+        if len(changes) == 0:
+            return []
+
+        if self.check_mode:
+            outcomes = [None] * len(changes)
+        else:
+            outcomes = self.parallel(self.change, changes)
+
+        errors = []
+        for ((add, group, user), error) in zip(changes, outcomes):
+            if error is not None:
+                errors.append("%s: %s" % (user, error))
+                continue
+
+            self.results['changed'] = True
+            if add:
+                self.results['jira_group_membership_sync_added'] += 1
+            else:
+                self.results['jira_group_membership_sync_removed'] += 1
+
+        return errors
+
+    def exec_module(self, **kwargs):
+        errors = self.results['jira_group_membership_sync_errors']
+
+        try:
+            groups = self.read_src()
+
+            done = set()
+            checkpoint = self.read_checkpoint()
+            if checkpoint is not None:
+                self.results['jira_group_membership_sync_resumed'] = True
+                done = set(checkpoint['done'])
+
+            for group in sorted(groups):
+                if group in done:
+                    continue
+
+                group_errors = self.sync_group(group, groups.pop(group))
+                self.results['jira_group_membership_sync_groups'] += 1
+                if len(group_errors) > 0:
+                    errors[group] = ', '.join(group_errors)
+                else:
+                    done.add(group)
+
+                if not self.check_mode:
+                    self.write_checkpoint(done)
+
+            path = self.param('checkpoint')
+            if len(errors) == 0 and path is not None and \
+                    not self.check_mode and os.path.exists(path):
+                os.remove(path)
+        except Exception as e:
+            self.fail(msg=e.message, **self.results)
+
+        if len(errors) > 0:
+            self.fail(
+                msg="Failed to sync %s group(s)" % (len(errors)),
+                **self.results)
+
+
+if __name__ == '__main__':
+    JiraGroupMembershipSync()
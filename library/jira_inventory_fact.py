@@ -0,0 +1,239 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import time
+
+from ansible.module_utils.jira_common import JiraModuleBase
+from ansible.module_utils.six.moves.urllib.parse import urlencode
+
+__metaclass__ = type
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+
+DOCUMENTATION = """
+module: jira_inventory_fact
+version_added: "0.0.1"
+short_description: snapshot Jira configuration collections
+description:
+  - Fetch several Jira configuration collections in one task.
+  - The collections are fetched concurrently, so they reflect the state
+    of Jira at (nearly) the same moment.
+  - Users and groups are enumerated the way C(jira_list_users_fact) and
+    C(jira_list_groups_fact) do with their default options, so only
+    active users are included.
+
+extends_documentation_fragment:
+  - jira_modules_common
+
+options:
+  include:
+    required: false
+    description:
+      - The collections to fetch. By default, all collections are fetched.
+    type: list
+    choices:
+      - groups
+      - issue_security_schemes
+      - issue_types
+      - notification_schemes
+      - permission_schemes
+      - project_categories
+      - project_types
+      - projects
+      - roles
+      - users
+      - workflows
+
+  exclude:
+    required: false
+    description:
+      - Collections to skip. Takes precedence over C(include).
+    type: list
+    default: []
+    choices:
+      - groups
+      - issue_security_schemes
+      - issue_types
+      - notification_schemes
+      - permission_schemes
+      - project_categories
+      - project_types
+      - projects
+      - roles
+      - users
+      - workflows
+
+  include_archived:
+    required: false
+    description:
+      - Include archived projects in the C(projects) collection.
+    type: bool
+    default: false
+
+author: "Joe Topjian <joe@topjian.net>"
+"""
+
+RETURN = """
+ansible_facts:
+  description: facts to add to ansible_facts
+  returned: always
+  type: complex
+  contains:
+    jira_inventory:
+      type: dict
+      description:
+        - Maps each fetched collection name to a list of dicts, in the
+          same form as the items of the matching jira_list_*_fact
+          module.
+        - For C(notification_schemes), the list holds the schemes of every
+          page, which jira_list_notification_schemes_fact returns in the
+          C(values) of a paginated dict instead.
+      returned: always
+
+jira_inventory_timing:
+  type: dict
+  description:
+    - Maps each fetched collection name to the time, in seconds, taken to
+      fetch it.
+  returned: always
+
+jira_inventory_elapsed:
+  type: float
+  description:
+    - The time, in seconds, taken to fetch all collections.
+  returned: always
+"""
+
+EXAMPLES = """
+- name: Snapshot the Jira configuration
+  jira_inventory_fact:
+
+- name: Snapshot only projects and schemes
+  jira_inventory_fact:
+    include:
+      - projects
+      - permission_schemes
+      - notification_schemes
+
+- name: Snapshot everything except workflows
+  jira_inventory_fact:
+    exclude:
+      - workflows
+"""
+
+# Maps a collection to its endpoint, query and the key holding its items.
+# Users and groups are enumerated through searches instead.
+COLLECTIONS = dict(
+    groups=(None, {}, None),
+    issue_security_schemes=(
+        "rest/api/2/issuesecurityschemes", {}, 'issueSecuritySchemes'),
+    issue_types=("rest/api/2/issuetype", {}, None),
+    notification_schemes=(
+        "rest/api/2/notificationscheme", {'expand': 'all'}, 'values'),
+    permission_schemes=(
+        "rest/api/2/permissionscheme", {'expand': 'all'},
+        'permissionSchemes'),
+    project_categories=("rest/api/2/projectCategory", {}, None),
+    project_types=("rest/api/2/project/type", {}, None),
+    projects=(
+        "rest/api/2/project",
+        {'expand': ','.join(['description', 'lead', 'url', 'projectKeys'])},
+        None),
+    roles=("rest/api/2/role", {}, None),
+    users=(None, {}, None),
+    workflows=("rest/api/2/workflow", {}, None),
+)
+
+
+class JiraInventory(JiraModuleBase):
+    """Utility class to snapshot Jira configuration collections as facts"""
+
+    def __init__(self):
+        self.module_args = dict(
+            include=dict(
+                required=False,
+                type='list',
+                choices=sorted(COLLECTIONS.keys())),
+
+            exclude=dict(
+                required=False,
+                type='list',
+                default=[],
+                choices=sorted(COLLECTIONS.keys())),
+
+            include_archived=dict(required=False, type='bool', default=False),
+        )
+
+        self.results = dict(
+            ansible_facts=dict(
+                jira_inventory=dict(),
+            ),
+            changed=False,
+        )
+
+        super(JiraInventory, self).__init__(
+            derived_arg_spec=self.module_args,
+            facts_module=True,
+            rest_endpoint=None,
+        )
+
+    def fetch_collection(self, name):
+        start = time.time()
+        (endpoint, query, key) = COLLECTIONS[name]
+
+        if name == 'projects':
+            query = dict(query, includeArchived=self.param('include_archived'))
+
+        if name == 'users':
+            v = self.enumerate_users()
+        elif name == 'groups':
+            v = self.enumerate_groups()
+        elif name == 'notification_schemes':
+            v = self.fetch_all_pages(endpoint, query)
+        else:
+            v = self.fetch(endpoint, urlencode(query))
+
+        if v is False:
+            items = []
+        elif key is not None:
+            items = v.get(key, [])
+        else:
+            items = v
+
+        return (items, round(time.time() - start, 3))
+
+    def exec_module(self, **kwargs):
+        start = time.time()
+
+        names = self.param('include')
+        if names is None:
+            names = sorted(COLLECTIONS.keys())
+        names = [n for n in names if n not in self.param('exclude')]
+
+        inventory = {}
+        timing = {}
+
+        # Missing connection settings fail the module before any worker
+        # thread starts.
+        self.get_connection_info()
+
+        try:
+            results = self.parallel(self.fetch_collection, names)
+            for (name, (items, elapsed)) in zip(names, results):
+                inventory[name] = items
+                timing[name] = elapsed
+
+            self.results['ansible_facts']['jira_inventory'] = inventory
+            self.results['jira_inventory_timing'] = timing
+            self.results['jira_inventory_elapsed'] = \
+                round(time.time() - start, 3)
+        except Exception as e:
+            self.fail(msg=e.message)
+
+
+if __name__ == '__main__':
+    JiraInventory()
@@ -1,7 +1,9 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
-from ansible.module_utils.jira_common import JiraModuleBase
+from ansible.module_utils.jira_common import JiraModuleBase, JiraModuleError
+from ansible.module_utils.jira_common import jql_quote
+from ansible.module_utils.six.moves.urllib.parse import urlencode
 
 __metaclass__ = type
 
@@ -19,9 +21,12 @@ description:
   - Manage a issue in Jira
   - This is a VERY simple representation of a Jira issue.
   - States and transitions are not supported yet.
+  - Several issues can be managed in one task with C(issues).
+  - Without C(key), existing issues can be found with C(match_on).
 
 extends_documentation_fragment:
   - jira_modules_common
+  - jira_modules_write
 
 options:
   key:
@@ -31,20 +36,23 @@ options:
       - Cannot be updated.
 
   summary:
-    required: true
+    required: false
     description:
       - The summary/name of the issue
+      - Required unless C(state) is C(absent).
 
   issue_type:
-    required: true
+    required: false
     description:
       - The issue type of the issue.
+      - Required to create an issue.
 
   project_key:
-    required: true
+    required: false
     description:
       - The Jira key of the project.
       - Cannot be updated
+      - Required unless C(state) is C(absent).
 
   assignee:
     required: false
@@ -61,6 +69,60 @@ options:
     description:
       - The description/contents of the issue.
 
+  label:
+    required: false
+    description:
+      - A label identifying the issue, for C(match_on=label).
+      - Added to the issue when it is created.
+      - Cannot be updated.
+
+  match_on:
+    required: false
+    description:
+      - How to find an existing issue when C(key) is not set.
+      - With C(summary), the issue of C(project_key) with exactly the
+        given C(summary) is used.
+      - With C(label), the issue of C(project_key) with the given
+        C(label) is used.
+      - The module fails if several issues match.
+      - In C(issues), the items are matched with batched JQL searches.
+    choices:
+      - summary
+      - label
+
+  state:
+    required: false
+    description:
+      - Whether the issue should exist or not.
+    default: present
+    choices:
+      - absent
+      - present
+
+  full_issue:
+    required: false
+    description:
+      - Return the issue with all of its fields.
+      - By default, only the fields managed by this module are read, both
+        to detect changes and to return the issue.
+    type: bool
+    default: false
+
+  issues:
+    required: false
+    description:
+      - A list of issues to manage. Each item is a dict taking the same
+        parameters as this module, except C(issues) and C(full_issue).
+      - Parameters missing from an item take their default value.
+      - Items with a C(key) are read with batched JQL searches and only
+        the issues which differ are updated.
+      - Two items cannot refer to, or match on, the same issue.
+      - Issues are submitted in chunks of 50 through the bulk create
+        endpoint and the chunks are submitted concurrently.
+      - Cannot be used with C(key), C(summary), C(project_key), C(label)
+        or C(match_on).
+    type: list
+
 author: "Joe Topjian <joe@topjian.net>"
 """
 
@@ -69,10 +131,20 @@ jira_issue:
   type: dict
   description:
     - A Jira issue.
+    - Only the managed fields are returned unless C(full_issue) is set.
     - See
       https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/issue-getIssue
       for the schema.
   returned: When a Jira issue was detected.
+
+jira_issue_results:
+  type: list
+  description:
+    - One dict per item of C(issues), in the same order.
+    - Each dict has the C(key) of the issue, the C(action) taken and the
+      C(error) reported by Jira for the item, if any.
+    - In check mode, C(key) is null for issues to be created.
+  returned: When C(issues) is set.
 """
 
 EXAMPLES = """
@@ -82,9 +154,44 @@ EXAMPLES = """
     issue_type: Task
     project_key: PRJ1
     description: This is an issue
+
+- name: Ensure several issues exist
+  jira_issue:
+    issues:
+      - summary: Test Issue 1
+        issue_type: Task
+        project_key: PRJ1
+      - summary: Test Issue 2
+        issue_type: Bug
+        project_key: PRJ1
+        assignee: admin
+
+- name: Ensure issue exists, matched by its summary
+  jira_issue:
+    summary: Test Issue
+    issue_type: Task
+    project_key: PRJ1
+    match_on: summary
+
+- name: Update existing issues
+  jira_issue:
+    issues:
+      - key: PRJ1-1
+        summary: Test Issue 1
+        issue_type: Task
+        project_key: PRJ1
+      - key: PRJ1-2
+        state: absent
 """
 
 REST_ENDPOINT = "rest/api/2/issue"
+BULK_ENDPOINT = "rest/api/2/issue/bulk"
+
+# The maximum number of issues Jira accepts in one bulk create request.
+BULK_CHUNK_SIZE = 50
+
+# The number of issue keys or match clauses in one JQL search.
+SEARCH_CHUNK_SIZE = 100
 
 
 class JiraProject(JiraModuleBase):
@@ -109,8 +216,17 @@ class JiraProject(JiraModuleBase):
                 _jira_field='key',
                 _jira_update=False),
 
+            label=dict(
+                required=False,
+                _jira_field='labels',
+                _jira_update=False),
+
+            match_on=dict(
+                required=False,
+                choices=['summary', 'label']),
+
             project_key=dict(
-                required=True,
+                required=False,
                 _jira_field='project',
                 _jira_update=False),
 
@@ -119,7 +235,7 @@ class JiraProject(JiraModuleBase):
                 _jira_update=True),
 
             summary=dict(
-                required=True,
+                required=False,
                 _jira_field='summary',
                 _jira_update=True),
 
@@ -127,6 +243,15 @@ class JiraProject(JiraModuleBase):
                 required=False,
                 default='present',
                 choices=['absent', 'present']),
+
+            full_issue=dict(
+                required=False,
+                type='bool',
+                default=False),
+
+            issues=dict(
+                required=False,
+                type='list'),
         )
 
         self.results = dict(
@@ -136,10 +261,185 @@ class JiraProject(JiraModuleBase):
 
         super(JiraProject, self).__init__(
             derived_arg_spec=self.module_args,
+            write_module=True,
             rest_endpoint=REST_ENDPOINT,
+            mutually_exclusive=[
+                ['issues', 'key'], ['issues', 'summary'],
+                ['issues', 'project_key'], ['issues', 'label'],
+                ['issues', 'match_on']],
+            required_one_of=[['issues', 'key', 'summary', 'label']],
         )
 
+    def validate(self, params):
+        match_on = params['match_on']
+        if match_on is not None and params['key'] is None:
+            for field in ['project_key', match_on]:
+                if params[field] is None:
+                    raise JiraModuleError(
+                        "%s is required to match on %s" % (field, match_on))
+
+        if params['state'] == 'absent':
+            return
+
+        if params['project_key'] is None:
+            raise JiraModuleError("project_key is required")
+
+        if params['summary'] is None:
+            raise JiraModuleError("summary is required")
+
+    def create_fields(self, params):
+        fields = {}
+        for (v, jira_field) in self.jira_fields():
+            if params[v] is None:
+                continue
+
+            if jira_field in ['assignee', 'issuetype', 'reporter']:
+                fields[jira_field] = {
+                    'name': params[v],
+                }
+
+            if jira_field == 'project':
+                fields[jira_field] = {
+                    'key': params[v],
+                }
+
+            if jira_field in ['description', 'summary']:
+                fields[jira_field] = params[v]
+
+            if jira_field == 'labels':
+                fields[jira_field] = [params[v]]
+
+        return fields
+
+    def managed_fields(self):
+        return [f for (v, f) in self.jira_fields() if f != 'key']
+
+    def issue_fields(self):
+        """The fields to search issues with, as issue_query reads them."""
+        if self.param('full_issue'):
+            return ['*all']
+
+        return self.managed_fields()
+
+    def issue_query(self):
+        """The query to read an issue with.
+
+        Only the managed fields are read, without any expansion, unless
+        the full issue was requested.
+        """
+        if self.param('full_issue'):
+            return None
+
+        return urlencode({'fields': ','.join(self.managed_fields())})
+
+    def match_clause(self, params):
+        clause = "project = %s" % (jql_quote(params['project_key']))
+        if params['match_on'] == 'summary':
+            # ~ is a text search, matches are filtered on the exact summary.
+            clause += " AND summary ~ %s" % (
+                jql_quote(jql_quote(params['summary'])))
+        if params['match_on'] == 'label':
+            clause += " AND labels = %s" % (jql_quote(params['label']))
+        return clause
+
+    def match_keys(self, issue, match_on):
+        project_key = issue['fields']['project']['key']
+        if match_on == 'summary':
+            return [(project_key, 'summary', issue['fields']['summary'])]
+        return [(project_key, 'label', label)
+                for label in issue['fields'].get('labels') or []]
+
+    def match_issues(self, desired, fields=None):
+        """Find the existing issues of items without a key.
+
+        The items are searched in chunks of OR'ed clauses, concurrently,
+        and the results are indexed locally. Returns a dict mapping the
+        index of each matched item in desired to its issue, read with
+        fields, the managed fields by default.
+        """
+        if fields is None:
+            fields = self.managed_fields()
+
+        items = [(i, p) for (i, p) in enumerate(desired)
+                 if p['key'] is None and p['match_on'] is not None]
+        chunks = [items[i:i + SEARCH_CHUNK_SIZE]
+                  for i in range(0, len(items), SEARCH_CHUNK_SIZE)]
+
+        criteria = set()
+        for (i, params) in items:
+            k = (params['project_key'], params['match_on'],
+                 params[params['match_on']])
+            if k in criteria:
+                raise JiraModuleError(
+                    "Items match on %s %s in %s more than once" % (
+                        k[1], k[2], k[0]))
+            criteria.add(k)
+
+        def search(chunk):
+            jql = ' OR '.join(
+                "(%s)" % (self.match_clause(p)) for (i, p) in chunk)
+            return list(self.search_issues(
+                jql, fields, page_size=SEARCH_CHUNK_SIZE))
+
+        index = {}
+        for issues in self.parallel(search, chunks):
+            for issue in issues:
+                for match_on in ['summary', 'label']:
+                    for k in self.match_keys(issue, match_on):
+                        index.setdefault(k, {})[issue['key']] = issue
+
+        matches = {}
+        for (i, params) in items:
+            value = params[params['match_on']]
+            k = (params['project_key'], params['match_on'], value)
+            found = index.get(k, {})
+            if len(found) > 1:
+                raise JiraModuleError(
+                    "%s issues match %s %s in %s: %s" % (
+                        len(found), params['match_on'], value,
+                        params['project_key'], ', '.join(sorted(found))))
+            if len(found) == 1:
+                matches[i] = list(found.values())[0]
+
+        return matches
+
+    def detect_updates(self, params, fields):
+        """Compare params to the fields of an existing issue.
+
+        Parameters which are not set are not managed and never cause an
+        update.
+        """
+        update_fields = {}
+
+        for (v, jira_field) in self.jira_update_fields():
+            if params[v] is None:
+                continue
+
+            if jira_field in ['assignee', 'issuetype', 'reporter']:
+                _name = None
+                if fields.get(jira_field) is not None:
+                    _name = fields[jira_field]['name']
+                if params[v] != _name:
+                    update_fields[jira_field] = {
+                        'name': params[v],
+                    }
+                continue
+
+            if jira_field == 'description':
+                if params[v] != (fields.get(jira_field) or ""):
+                    update_fields[jira_field] = params[v]
+                continue
+
+            if params[v] != fields.get(jira_field):
+                update_fields[jira_field] = params[v]
+
+        return update_fields
+
     def exec_module(self, **kwargs):
+        if self.param('issues') is not None:
+            self.exec_bulk(self.param('issues'))
+            return
+
         action = None
         is_install_mode = self.param('state') == 'present'
 
@@ -151,14 +451,24 @@ class JiraProject(JiraModuleBase):
             'fields': dict(),
         }
 
-        issue_endpoint = "%s/%s" % (REST_ENDPOINT, self.param('key'))
+        key = self.param('key')
 
         try:
-            self.rest_endpoint = issue_endpoint
-            if self.param('key') is not None:
-                issue = self.get()
-            else:
-                issue = False
+            self.validate(self.module.params)
+
+            issue = False
+            if key is not None:
+                self.rest_endpoint = "%s/%s" % (REST_ENDPOINT, key)
+                issue = self.get(self.issue_query())
+            elif self.param('match_on') is not None:
+                # The search returns the matched issue, it is not read
+                # again.
+                issue = self.match_issues(
+                    [self.module.params], self.issue_fields()).get(0, False)
+                if issue is not False:
+                    key = issue['key']
+
+            issue_endpoint = "%s/%s" % (REST_ENDPOINT, key)
 
             if not is_install_mode:
                 if issue is False:
@@ -168,88 +478,12 @@ class JiraProject(JiraModuleBase):
                 if issue is False:
                     action = 'created'
 
-                    for (v, jira_field) in self.jira_fields():
-                        if jira_field == 'assignee':
-                            if self.param(v) is not None:
-                                create_dict['fields'][jira_field] = {
-                                    'name': self.param(v),
-                                }
-
-                        if jira_field == 'description':
-                            if self.param(v) is not None:
-                                create_dict['fields'][jira_field] = \
-                                    self.param(v)
-
-                        if jira_field == 'issuetype':
-                            if self.param(v) is not None:
-                                create_dict['fields'][jira_field] = {
-                                    'name': self.param(v),
-                                }
-
-                        if jira_field == 'project':
-                            if self.param(v) is not None:
-                                create_dict['fields']['project'] = {
-                                    'key': self.param(v),
-                                }
-
-                        if jira_field == 'reporter':
-                            if self.param(v) is not None:
-                                create_dict['fields'][jira_field] = {
-                                    'name': self.param(v),
-                                }
-
-                        if jira_field == 'summary':
-                            if self.param(v) is not None:
-                                create_dict['fields']['summary'] = \
-                                    self.param(v)
+                    create_dict['fields'] = self.create_fields(
+                        self.module.params)
 
                 else:
-                    # Detect updates
-                    for (v, jira_field) in self.jira_update_fields():
-                        if jira_field in issue:
-                            if jira_field == 'assignee':
-                                asn = self.param(v)
-                                _asn = issue[jira_field]['name']
-                                if asn != _asn:
-                                    update_dict['fields'][jira_field] = {
-                                        'name': asn
-                                    }
-                                continue
-
-                            if jira_field == "description":
-                                desc = self.param(v)
-                                _desc = issue[jira_field]
-                                if desc is None and _desc == "":
-                                    continue
-                                if desc != _desc:
-                                    if _desc is None:
-                                        update_dict['fields'][jira_field] = ""
-                                    else:
-                                        update_dict['fields'][jira_field] = \
-                                            self.param(v)
-                                continue
-
-                            if jira_field == 'issueType':
-                                it = self.param(v)
-                                _it = issue[jira_field]['name']
-                                if it != _it:
-                                    update_dict['fields'][jira_field] = {
-                                        'name': it,
-                                    }
-                                continue
-
-                            if jira_field == 'reporter':
-                                asn = self.param(v)
-                                _asn = issue[jira_field]['name']
-                                if asn != _asn:
-                                    update_dict['fields'][jira_field] = {
-                                        'name': asn,
-                                    }
-                                continue
-
-                            if self.param(v) != issue[jira_field]:
-                                update_dict['fields'][jira_field] = \
-                                    self.param(v)
+                    update_dict['fields'] = self.detect_updates(
+                        self.module.params, issue['fields'])
 
                     if len(update_dict['fields']) > 0:
                         action = 'updated'
@@ -270,7 +504,9 @@ class JiraProject(JiraModuleBase):
                     key = issue['key']
                     issue_endpoint = "%s/%s" % (REST_ENDPOINT, key)
                     self.rest_endpoint = issue_endpoint
-                    issue = self.get()
+                    issue = self.write_result(
+                        issue, lambda: self.get(self.issue_query()),
+                        'fields')
                     self.results['jira_issue'] = issue
 
                 return
@@ -278,7 +514,8 @@ class JiraProject(JiraModuleBase):
             if action == 'updated':
                 self.rest_endpoint = issue_endpoint
                 issue = self.put(update_dict)
-                issue = self.get()
+                issue = self.write_result(
+                    issue, lambda: self.get(self.issue_query()), 'fields')
                 self.results['jira_issue'] = issue
                 return
 
@@ -290,6 +527,197 @@ class JiraProject(JiraModuleBase):
         except Exception as e:
             self.fail(msg=e.message)
 
+    def create_chunk(self, chunk):
+        """Create a chunk of issues in one bulk request.
+
+        Returns a list with, for each issue of the chunk, a tuple of the
+        key of the created issue and the error reported for it.
+        """
+        data = {
+            'issueUpdates': [{'fields': fields} for fields in chunk],
+        }
+
+        try:
+            response = self.fetch(BULK_ENDPOINT, data=data, method='POST')
+        except JiraModuleError as e:
+            # Jira answers with an error status when no issue of the chunk
+            # could be created. The body still holds the per-issue errors.
+            response = e.body
+            if not isinstance(response, dict) or 'errors' not in response:
+                return [(None, e.message)] * len(chunk)
+
+        errors = {}
+        for error in response.get('errors') or []:
+            element_errors = error.get('elementErrors', {})
+            msgs = list(element_errors.get('errorMessages', []))
+            for (field, msg) in element_errors.get('errors', {}).items():
+                msgs.append("%s: %s" % (field, msg))
+            errors[error['failedElementNumber']] = ', '.join(msgs)
+
+        # Created issues are listed in submission order, skipping the
+        # issues that failed.
+        created = iter(response.get('issues') or [])
+        results = []
+        for i in range(len(chunk)):
+            if i in errors:
+                results.append((None, errors[i]))
+            else:
+                issue = next(created, None)
+                if issue is None:
+                    results.append((None, "Issue was not created"))
+                else:
+                    results.append((issue['key'], None))
+
+        return results
+
+    def search_chunk(self, keys):
+        # Keys of deleted issues must not fail the whole search.
+        return list(self.search_issues(
+            "key in (%s)" % (', '.join(keys)), self.managed_fields(),
+            page_size=len(keys), validate=False))
+
+    def read_issues(self, keys):
+        """Read the issues with the given keys, keyed by requested key.
+
+        The keys are searched in chunks so each JQL query stays well
+        under Jira's query size limits, and the chunks are searched
+        concurrently.
+
+        An issue which was renamed or moved to another project is
+        returned under its new key, so keys missing from the results are
+        read one by one, which follows the move.
+        """
+        keys = sorted(set(keys))
+        chunks = [keys[i:i + SEARCH_CHUNK_SIZE]
+                  for i in range(0, len(keys), SEARCH_CHUNK_SIZE)]
+
+        existing = {}
+        for issues in self.parallel(self.search_chunk, chunks):
+            for issue in issues:
+                existing[issue['key']] = issue
+
+        query = urlencode({'fields': ','.join(self.managed_fields())})
+        (moved, missing) = self.lookup_all(
+            lambda key: self.fetch("%s/%s" % (REST_ENDPOINT, key), query),
+            [k for k in keys if k not in existing])
+        existing.update(moved)
+
+        return existing
+
+    def plan(self, desired):
+        keys = [p['key'] for p in desired if p['key'] is not None]
+        existing = self.read_issues(keys)
+        matches = self.match_issues(desired)
+
+        plan = []
+        planned = set()
+        for (i, params) in enumerate(desired):
+            issue = existing.get(params['key'])
+            if i in matches:
+                issue = matches[i]
+            if issue is not None:
+                params['key'] = issue['key']
+                if issue['key'] in planned:
+                    raise JiraModuleError(
+                        "Issue %s is listed more than once" % (
+                            issue['key']))
+                planned.add(issue['key'])
+            if params['state'] == 'absent':
+                if issue is None:
+                    plan.append((params, None, None))
+                else:
+                    plan.append((params, 'deleted', None))
+            elif issue is None:
+                plan.append((params, 'created', self.create_fields(params)))
+            else:
+                update_fields = self.detect_updates(params, issue['fields'])
+                if len(update_fields) > 0:
+                    plan.append((params, 'updated', update_fields))
+                else:
+                    plan.append((params, None, None))
+
+        return plan
+
+    def apply(self, job):
+        """Apply a job, returning a list of (key, error) per step.
+
+        A job is either a chunk of creates, submitted in one bulk
+        request, or a single update or delete.
+        """
+        (action, steps) = job
+        if action == 'created':
+            return self.create_chunk([data for (params, data) in steps])
+
+        (params, data) = steps[0]
+        endpoint = "%s/%s" % (REST_ENDPOINT, params['key'])
+
+        try:
+            if action == 'updated':
+                self.fetch(endpoint, data={'fields': data}, method='PUT')
+            if action == 'deleted':
+                self.fetch(endpoint, method='DELETE')
+        except JiraModuleError as e:
+            return [(None, e.message)]
+
+        return [(params['key'], None)]
+
+    def exec_bulk(self, issues):
+        try:
+            desired = []
+            for item in issues:
+                params = self.item_params(item, 'issues')
+                if params['full_issue']:
+                    raise JiraModuleError(
+                        "Items of issues cannot set full_issue")
+                self.validate(params)
+                desired.append(params)
+
+            plan = self.plan(desired)
+        except Exception as e:
+            self.fail(msg=e.message)
+
+        del(self.results['jira_issue'])
+
+        results = []
+        for (params, action, data) in plan:
+            results.append(dict(key=params['key'], action=action, error=None))
+            if action is not None:
+                self.results['changed'] = True
+        self.results['jira_issue_results'] = results
+
+        if self.check_mode:
+            return
+
+        creates = [i for (i, step) in enumerate(plan) if step[1] == 'created']
+        jobs = []
+        for i in range(0, len(creates), BULK_CHUNK_SIZE):
+            jobs.append(creates[i:i + BULK_CHUNK_SIZE])
+        for (i, step) in enumerate(plan):
+            if step[1] in ['updated', 'deleted']:
+                jobs.append([i])
+
+        def run(indexes):
+            action = plan[indexes[0]][1]
+            return self.apply(
+                (action, [(plan[i][0], plan[i][2]) for i in indexes]))
+
+        errors = 0
+        for (indexes, outcomes) in zip(jobs, self.parallel(run, jobs)):
+            for (i, (key, error)) in zip(indexes, outcomes):
+                if error is not None:
+                    results[i]['action'] = None
+                    results[i]['error'] = error
+                    errors += 1
+                else:
+                    results[i]['key'] = key
+
+        if errors > 0:
+            self.results['changed'] = \
+                len([r for r in results if r['action'] is not None]) > 0
+            self.fail(
+                msg="Failed to apply changes to %s issue(s)" % (errors),
+                **self.results)
+
 
 if __name__ == '__main__':
     JiraProject()
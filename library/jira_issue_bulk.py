@@ -0,0 +1,463 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import json
+import os
+
+from ansible.module_utils.jira_common import JiraModuleBase, JiraModuleError
+from ansible.module_utils.jira_common import write_json
+from ansible.module_utils.six.moves.urllib.parse import urlencode
+
+__metaclass__ = type
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+
+DOCUMENTATION = """
+module: jira_issue_bulk
+version_added: "0.0.1"
+short_description: edit, transition or delete the issues matching a JQL query
+description:
+  - Apply the same edit or workflow transition to every issue matching a
+    JQL query, or delete them.
+  - Matching issues are read page by page and the issues of a page are
+    processed concurrently.
+  - Progress can be recorded in a checkpoint file, so an interrupted run
+    resumes where it stopped.
+
+extends_documentation_fragment:
+  - jira_modules_common
+
+options:
+  jql:
+    required: true
+    description:
+      - The JQL query matching the issues to process.
+      - Cannot have an ORDER BY clause.
+
+  update:
+    required: false
+    description:
+      - The edit to apply, in the form of the C(update) of Jira's edit
+        issue request.
+      - Maps each field to a list of operations. Each operation is a dict
+        with a single C(add), C(remove), C(set) or C(edit) key.
+      - With C(transition), the edit is applied by the transition and the
+        fields must be on the transition screen.
+    type: dict
+
+  transition:
+    required: false
+    description:
+      - The name or ID of a workflow transition to apply to the issues.
+      - The transitions available from each combination of project,
+        issue type and status are looked up once per run.
+
+  state:
+    required: false
+    description:
+      - With C(absent), the matching issues are deleted.
+      - C(update) or C(transition) is required unless C(state) is
+        C(absent), and neither can be used with C(absent).
+    default: present
+    choices:
+      - absent
+      - present
+
+  delete_subtasks:
+    required: false
+    description:
+      - Delete the subtasks of the deleted issues along with them.
+      - Otherwise, deleting an issue which has subtasks fails.
+    type: bool
+    default: true
+
+  notify_users:
+    required: false
+    description:
+      - Whether Jira sends notifications for the edits.
+      - Disabling notifications requires administrator permissions.
+      - Transitions always notify.
+    type: bool
+    default: true
+
+  page_size:
+    required: false
+    description:
+      - The number of issues read per search.
+    type: int
+    default: 100
+
+  checkpoint:
+    required: false
+    description:
+      - The path of a file recording the progress of the run.
+      - If the file exists, the run resumes after the last issue it
+        records and the issues which failed are retried.
+      - The file is removed once every issue was processed.
+
+author: "Joe Topjian <joe@topjian.net>"
+"""
+
+RETURN = """
+jira_issue_bulk_count:
+  type: int
+  description:
+    - The number of issues edited, transitioned or deleted by this run.
+    - Subtasks deleted along with their parent are counted when they
+      match C(jql).
+    - In check mode, the number of issues matching C(jql).
+  returned: always
+
+jira_issue_bulk_errors:
+  type: dict
+  description:
+    - Maps the key of each issue which could not be processed to the
+      error reported by Jira.
+  returned: always
+
+jira_issue_bulk_resumed:
+  type: bool
+  description:
+    - Whether the run resumed from C(checkpoint).
+  returned: always
+"""
+
+EXAMPLES = """
+- name: Relabel issues
+  jira_issue_bulk:
+    jql: project = PRJ1 AND labels = old-label
+    update:
+      labels:
+        - add: new-label
+        - remove: old-label
+    checkpoint: /var/tmp/relabel.json
+
+- name: Reassign issues
+  jira_issue_bulk:
+    jql: project = PRJ1 AND assignee = jdoe
+    update:
+      assignee:
+        - set:
+            name: admin
+    notify_users: false
+
+- name: Close resolved issues and label them
+  jira_issue_bulk:
+    jql: project = PRJ1 AND status = Resolved
+    transition: Close Issue
+    update:
+      labels:
+        - add: closed-in-bulk
+
+- name: Count the issues of a test project
+  jira_issue_bulk:
+    jql: project = TEST
+    state: absent
+  check_mode: true
+
+- name: Delete the issues of a test project
+  jira_issue_bulk:
+    jql: project = TEST
+    state: absent
+"""
+
+REST_ENDPOINT = "rest/api/2/issue"
+
+UPDATE_OPERATIONS = ['add', 'edit', 'remove', 'set']
+
+
+class JiraIssueBulk(JiraModuleBase):
+    """Utility class to process the issues matching a JQL query"""
+
+    def __init__(self):
+        self.module_args = dict(
+            jql=dict(
+                required=True,
+                type='str'),
+
+            update=dict(
+                required=False,
+                type='dict'),
+
+            transition=dict(
+                required=False,
+                type='str'),
+
+            state=dict(
+                required=False,
+                default='present',
+                choices=['absent', 'present']),
+
+            delete_subtasks=dict(
+                required=False,
+                type='bool',
+                default=True),
+
+            notify_users=dict(
+                required=False,
+                type='bool',
+                default=True),
+
+            page_size=dict(
+                required=False,
+                type='int',
+                default=100),
+
+            checkpoint=dict(
+                required=False,
+                type='path'),
+        )
+
+        # Maps (project, issue type, status) ids to the IDs of the
+        # transitions available from them, by name and ID.
+        self.transition_ids = {}
+
+        self.results = dict(
+            jira_issue_bulk_count=0,
+            jira_issue_bulk_errors=dict(),
+            jira_issue_bulk_resumed=False,
+            changed=False,
+        )
+
+        super(JiraIssueBulk, self).__init__(
+            derived_arg_spec=self.module_args,
+            rest_endpoint=REST_ENDPOINT,
+            supports_check_mode=True,
+        )
+
+    def validate(self):
+        changes = [self.param('update'), self.param('transition')]
+        if self.param('state') == 'absent':
+            if changes != [None, None]:
+                raise JiraModuleError(
+                    "update and transition cannot be used with state absent")
+        elif changes == [None, None]:
+            raise JiraModuleError("One of update or transition is required")
+
+        for (field, operations) in (self.param('update') or {}).items():
+            if not isinstance(operations, list):
+                raise JiraModuleError(
+                    "The operations of %s must be a list" % (field))
+
+            for op in operations:
+                if not isinstance(op, dict) or len(op) != 1 or \
+                        list(op.keys())[0] not in UPDATE_OPERATIONS:
+                    raise JiraModuleError(
+                        "Invalid operation for %s: %s. Operations are "
+                        "dicts with one of: %s" % (
+                            field, op, ', '.join(UPDATE_OPERATIONS)))
+
+    def run_id(self):
+        return dict(
+            jql=self.param('jql'),
+            update=self.param('update'),
+            transition=self.param('transition'),
+            state=self.param('state'),
+        )
+
+    def read_checkpoint(self):
+        path = self.param('checkpoint')
+        if path is None or not os.path.exists(path):
+            return None
+
+        try:
+            with open(path) as f:
+                checkpoint = json.load(f)
+        except (IOError, OSError, ValueError) as e:
+            raise JiraModuleError(
+                "Unable to read checkpoint %s: %s" % (path, e))
+
+        if checkpoint.get('run') != self.run_id():
+            raise JiraModuleError(
+                "Checkpoint %s was written by a different run, remove it "
+                "to start over" % (path))
+
+        return checkpoint
+
+    def write_checkpoint(self, last_id, failed):
+        path = self.param('checkpoint')
+        if path is None:
+            return
+
+        checkpoint = dict(
+            run=self.run_id(),
+            last_id=last_id,
+            failed=failed,
+        )
+
+        try:
+            write_json(path, checkpoint)
+        except (IOError, OSError) as e:
+            raise JiraModuleError(
+                "Unable to write checkpoint %s: %s" % (path, e))
+
+    def remove_checkpoint(self):
+        path = self.param('checkpoint')
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+    def issue_fields(self):
+        if self.param('state') == 'absent':
+            return ['parent']
+        if self.param('transition') is None:
+            return ['key']
+        return ['project', 'issuetype', 'status']
+
+    def workflow_state(self, issue):
+        fields = issue['fields']
+        return (fields['project']['id'], fields['issuetype']['id'],
+                fields['status']['id'])
+
+    def resolve_transitions(self, issues):
+        """Look up the transitions available to the given issues.
+
+        The transitions only depend on the workflow, which is set by the
+        project and issue type, and on the status of the issue. They are
+        fetched for one issue of each combination not seen before.
+        """
+        samples = {}
+        for issue in issues:
+            state = self.workflow_state(issue)
+            if state not in self.transition_ids:
+                samples.setdefault(state, issue['key'])
+
+        def fetch_transitions(key):
+            endpoint = "%s/%s/transitions" % (REST_ENDPOINT, key)
+            v = self.fetch(endpoint)
+            if v is False:
+                return {}
+
+            ids = {}
+            for t in v.get('transitions', []):
+                ids[t['name']] = t['id']
+                ids[t['id']] = t['id']
+            return ids
+
+        states = list(samples.keys())
+        keys = [samples[state] for state in states]
+        transitions = self.parallel(fetch_transitions, keys)
+        for (state, ids) in zip(states, transitions):
+            self.transition_ids[state] = ids
+
+    def apply(self, issue):
+        endpoint = "%s/%s" % (REST_ENDPOINT, issue['key'])
+        query = None
+        if not self.param('notify_users'):
+            query = urlencode({'notifyUsers': 'false'})
+
+        try:
+            if self.param('state') == 'absent':
+                q = {'deleteSubtasks': 'false'}
+                if self.param('delete_subtasks'):
+                    q['deleteSubtasks'] = 'true'
+                # fetch returns False, rather than failing, for an issue
+                # which is already gone.
+                self.fetch(endpoint, urlencode(q), method='DELETE')
+                return None
+
+            if self.param('transition') is None:
+                self.fetch(
+                    endpoint, query, data={'update': self.param('update')},
+                    method='PUT')
+                return None
+
+            state = self.workflow_state(issue)
+            transition_id = self.transition_ids[state].get(
+                self.param('transition'))
+            if transition_id is None:
+                return "Transition %s is not available from status %s" % (
+                    self.param('transition'),
+                    issue['fields']['status']['name'])
+
+            data = {'transition': {'id': transition_id}}
+            if self.param('update') is not None:
+                data['update'] = self.param('update')
+            self.fetch(endpoint + "/transitions", data=data, method='POST')
+        except JiraModuleError as e:
+            return e.message
+
+        return None
+
+    def apply_all(self, issues, errors):
+        if self.param('transition') is not None:
+            self.resolve_transitions(issues)
+
+        # Subtasks whose parent is deleted along with them are left to the
+        # parent, deleting them concurrently would race with it.
+        subtasks = {}
+        if self.param('state') == 'absent' and self.param('delete_subtasks'):
+            keys = set([issue['key'] for issue in issues])
+            for issue in issues:
+                parent = issue['fields'].get('parent')
+                if parent is not None and parent['key'] in keys:
+                    subtasks.setdefault(parent['key'], []).append(issue)
+            skipped = set([i['key'] for v in subtasks.values() for i in v])
+            issues = [i for i in issues if i['key'] not in skipped]
+
+        count = 0
+        for (issue, error) in zip(issues, self.parallel(self.apply, issues)):
+            if error is None:
+                count += 1 + len(subtasks.get(issue['key'], []))
+            else:
+                errors[issue['key']] = error
+
+        self.results['jira_issue_bulk_count'] += count
+        if count > 0:
+            self.results['changed'] = True
+
+    def read_failed(self, keys):
+        """Read the issues of a checkpoint which failed to be processed."""
+        issues = []
+        keys = sorted(keys)
+        for i in range(0, len(keys), self.param('page_size')):
+            chunk = keys[i:i + self.param('page_size')]
+            issues.extend(self.search_issues(
+                "key in (%s)" % (', '.join(chunk)), self.issue_fields(),
+                page_size=len(chunk), validate=False))
+        return issues
+
+    def exec_module(self, **kwargs):
+        errors = self.results['jira_issue_bulk_errors']
+
+        try:
+            self.validate()
+
+            if self.check_mode:
+                count = self.count_issues(self.param('jql'))
+                self.results['jira_issue_bulk_count'] = count
+                self.results['changed'] = count > 0
+                return
+
+            last_id = None
+            checkpoint = self.read_checkpoint()
+            if checkpoint is not None:
+                self.results['jira_issue_bulk_resumed'] = True
+                last_id = checkpoint['last_id']
+                self.apply_all(self.read_failed(checkpoint['failed']), errors)
+                self.write_checkpoint(last_id, errors)
+
+            pages = self.iter_issue_pages(
+                self.param('jql'), self.issue_fields(),
+                self.param('page_size'), last_id)
+            for issues in pages:
+                self.apply_all(issues, errors)
+                last_id = issues[-1]['id']
+                self.write_checkpoint(last_id, errors)
+
+            if len(errors) == 0:
+                self.remove_checkpoint()
+        except Exception as e:
+            self.fail(msg=e.message, **self.results)
+
+        if len(errors) > 0:
+            self.fail(
+                msg="Failed to process %s issue(s)" % (len(errors)),
+                **self.results)
+
+
+if __name__ == '__main__':
+    JiraIssueBulk()
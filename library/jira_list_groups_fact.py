@@ -1,8 +1,10 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
+import time
+
 from ansible.module_utils.jira_common import JiraModuleBase
-from ansible.module_utils.six.moves.urllib.parse import urlencode
+from ansible.module_utils.jira_common import GROUP_SHARD_CHARACTERS
 
 __metaclass__ = type
 
@@ -21,6 +23,7 @@ description:
 
 extends_documentation_fragment:
   - jira_modules_common
+  - jira_modules_list
 
 options:
   query:
@@ -39,6 +42,25 @@ options:
       - Return groups where username is a member.
     default: false
 
+  page_size:
+    required: false
+    description:
+      - The maximum number of groups to request per search.
+      - The group picker has no offset, so when a search matches more
+        groups than this, it is split into narrower searches (the query
+        with a character added before or after it) which are run
+        concurrently and deduplicated by group name. Searches that are
+        still truncated are split again.
+    default: 1000
+    type: int
+
+  shard_characters:
+    required: false
+    description:
+      - The characters used to build narrower searches when a search is
+        truncated.
+    default: "abcdefghijklmnopqrstuvwxyz0123456789-_ "
+
 author: "Joe Topjian <joe@topjian.net>"
 """
 
@@ -53,10 +75,23 @@ ansible_facts:
       description:
         - Maps Jira groups to a non-empty list of dicts with
           group information.
+        - A dict keyed by C(index_by) instead, when it is set.
         - See
           https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/groups-findGroups
           for the schema.
       returned: When Jira groups are detected.
+
+jira_groups_total:
+  type: int
+  description:
+    - The number of unique groups found.
+  returned: always
+
+jira_groups_elapsed:
+  type: float
+  description:
+    - The time, in seconds, taken to enumerate the groups.
+  returned: always
 """
 
 EXAMPLES = """
@@ -75,9 +110,13 @@ class JiraListGroups(JiraModuleBase):
 
     def __init__(self):
         self.module_args = dict(
-            query=dict(required=False, _jira_field='query'),
-            exclude=dict(required=False, _jira_field='exclude'),
-            username=dict(required=False, _jira_field='username'),
+            query=dict(required=False),
+            exclude=dict(required=False),
+            username=dict(required=False),
+            page_size=dict(required=False, type='int', default=1000),
+            shard_characters=dict(
+                required=False,
+                default=GROUP_SHARD_CHARACTERS),
         )
 
         self.results = dict(
@@ -90,23 +129,26 @@ class JiraListGroups(JiraModuleBase):
         super(JiraListGroups, self).__init__(
             derived_arg_spec=self.module_args,
             facts_module=True,
+            list_module=True,
             rest_endpoint=REST_ENDPOINT,
         )
 
     def exec_module(self, **kwargs):
-        query = {}
-
-        for (field, jira_field) in self.jira_fields():
-            v = self.param(field)
-            if v:
-                query[jira_field] = v
+        start = time.time()
 
         try:
-            v = self.get(urlencode(query))
-            if v is False:
-                del(self.results['ansible_facts']['jira_groups'])
-            else:
-                self.results['ansible_facts']['jira_groups'] = v['groups']
+            groups = self.enumerate_groups(
+                group_query=self.param('query') or '',
+                exclude=self.param('exclude'),
+                username=self.param('username'),
+                page_size=self.param('page_size'),
+                shard_characters=self.param('shard_characters'))
+
+            self.results['ansible_facts']['jira_groups'] = \
+                self.list_fact(groups)
+            self.results['jira_groups_total'] = len(groups)
+            self.results['jira_groups_elapsed'] = \
+                round(time.time() - start, 3)
         except Exception as e:
             self.fail(msg=e.message)
 
@@ -20,6 +20,7 @@ description:
 
 extends_documentation_fragment:
   - jira_modules_common
+  - jira_modules_list
 
 author: "Joe Topjian <joe@topjian.net>"
 """
@@ -35,6 +36,7 @@ ansible_facts:
       description:
         - Maps Jira issue security schemes to a non-empty list of dicts with
           issue security schemes information.
+        - A dict keyed by C(index_by) instead, when it is set.
         - See
           https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/issuesecurityschemes-getIssueSecuritySchemes
           for the schema.
@@ -65,6 +67,7 @@ class JiraListIssueSecuritySchemes(JiraModuleBase):
         super(JiraListIssueSecuritySchemes, self).__init__(
             derived_arg_spec=self.module_args,
             facts_module=True,
+            list_module=True,
             rest_endpoint=REST_ENDPOINT,
         )
 
@@ -75,7 +78,7 @@ class JiraListIssueSecuritySchemes(JiraModuleBase):
             if v is False:
                 del(self.results['ansible_facts'][key])
             else:
-                self.results['ansible_facts'][key] = v
+                self.results['ansible_facts'][key] = self.list_fact(v)
         except Exception as e:
             self.fail(msg=e.message)
 
@@ -2,7 +2,6 @@
 # -*- coding: utf-8 -*-
 
 from ansible.module_utils.jira_common import JiraModuleBase
-from ansible.module_utils.six.moves.urllib.parse import urlencode
 
 __metaclass__ = type
 
@@ -18,9 +17,11 @@ version_added: "0.0.1"
 short_description: list notification schemes in Jira
 description:
   - List notification schemes in Jira
+  - Every page of notification schemes is read.
 
 extends_documentation_fragment:
   - jira_modules_common
+  - jira_modules_list
 
 author: "Joe Topjian <joe@topjian.net>"
 """
@@ -36,6 +37,7 @@ ansible_facts:
       description:
         - Maps Jira notification schemes to a non-empty list of dicts with
           notification schemes information.
+        - A dict keyed by C(index_by) instead, when it is set.
         - See
           https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/notificationscheme-getNotificationSchemes
           for the schema.
@@ -66,6 +68,7 @@ class JiraListNotificationSchemes(JiraModuleBase):
         super(JiraListNotificationSchemes, self).__init__(
             derived_arg_spec=self.module_args,
             facts_module=True,
+            list_module=True,
             rest_endpoint=REST_ENDPOINT,
         )
 
@@ -75,10 +78,12 @@ class JiraListNotificationSchemes(JiraModuleBase):
         }
 
         try:
-            v = self.get(urlencode(query))
+            v = self.fetch_all_pages(REST_ENDPOINT, query)
             if v is False:
                 del(self.results['ansible_facts']['jira_notification_schemes'])
             else:
+                if self.param('index_by') is not None:
+                    v = self.list_fact(v['values'])
                 self.results['ansible_facts']['jira_notification_schemes'] = v
         except Exception as e:
             self.fail(msg=e.message)
@@ -21,6 +21,7 @@ description:
 
 extends_documentation_fragment:
   - jira_modules_common
+  - jira_modules_list
 
 author: "Joe Topjian <joe@topjian.net>"
 """
@@ -36,6 +37,7 @@ ansible_facts:
       description:
         - Maps Jira permission schemes to a non-empty list of dicts with
           permission schemes information.
+        - A dict keyed by C(index_by) instead, when it is set.
         - See
           https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/permissionscheme-getPermissionSchemes
           for the schema.
@@ -66,6 +68,7 @@ class JiraListPermissionSchemes(JiraModuleBase):
         super(JiraListPermissionSchemes, self).__init__(
             derived_arg_spec=self.module_args,
             facts_module=True,
+            list_module=True,
             rest_endpoint=REST_ENDPOINT,
         )
 
@@ -80,7 +83,7 @@ class JiraListPermissionSchemes(JiraModuleBase):
                 del(self.results['ansible_facts']['jira_permission_schemes'])
             else:
                 self.results['ansible_facts']['jira_permission_schemes'] = \
-                    v['permissionSchemes']
+                    self.list_fact(v['permissionSchemes'])
         except Exception as e:
             self.fail(msg=e.message)
 
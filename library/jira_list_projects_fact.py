@@ -21,6 +21,7 @@ description:
 
 extends_documentation_fragment:
   - jira_modules_common
+  - jira_modules_list
 
 options:
   include_archived:
@@ -30,6 +31,28 @@ options:
     default: false
     type: bool
 
+  enrich:
+    required: false
+    description:
+      - Additional information to fetch for every project.
+      - C(permission_scheme), C(notification_scheme), C(workflow_scheme)
+        and C(issue_security_scheme) add the scheme the project uses as
+        C(permissionScheme), C(notificationScheme), C(workflowScheme) and
+        C(issueSecurityScheme). The value is null when the project has no
+        such scheme.
+      - C(roles) adds the project's roles, mapping role names to their
+        URLs, as C(roles).
+      - The requests for all projects are run concurrently, bounded by
+        C(concurrency).
+    type: list
+    default: []
+    choices:
+      - issue_security_scheme
+      - notification_scheme
+      - permission_scheme
+      - roles
+      - workflow_scheme
+
 author: "Joe Topjian <joe@topjian.net>"
 """
 
@@ -44,6 +67,8 @@ ansible_facts:
       type: list
         - Maps Jira projects to a non-empty list of dicts with
           project information.
+        - A dict keyed by C(index_by) instead, when it is set.
+        - Each project includes the information requested with C(enrich).
         - See
           https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/project-getAllProjects
           for the schema.
@@ -56,10 +81,37 @@ EXAMPLES = """
     jira_url: '{{ server }}'
     jira_username: '{{ user }}'
     jira_password: '{{ pass }}'
+
+- name: List Projects keyed by project key
+  jira_list_projects_fact:
+    index_by: key
+
+- name: Look up a project
+  debug:
+    msg: "{{ jira_projects['PROJ'].lead.name }}"
+
+- name: List Projects with the schemes they use
+  jira_list_projects_fact:
+    enrich:
+      - permission_scheme
+      - notification_scheme
+      - workflow_scheme
+      - issue_security_scheme
+    concurrency: 16
 """
 
 REST_ENDPOINT = "rest/api/2/project"
 
+# Maps an enrich choice to the project sub-resource and the project
+# attribute it is stored as.
+ENRICHMENTS = dict(
+    issue_security_scheme=('issuesecuritylevelscheme', 'issueSecurityScheme'),
+    notification_scheme=('notificationscheme', 'notificationScheme'),
+    permission_scheme=('permissionscheme', 'permissionScheme'),
+    roles=('role', 'roles'),
+    workflow_scheme=('workflowscheme', 'workflowScheme'),
+)
+
 
 class JiraListProjects(JiraModuleBase):
     """Utility class to get list of Jira projects as facts"""
@@ -67,6 +119,11 @@ class JiraListProjects(JiraModuleBase):
     def __init__(self):
         self.module_args = dict(
             include_archived=dict(required=False, type='bool', default=False),
+            enrich=dict(
+                required=False,
+                type='list',
+                default=[],
+                choices=sorted(ENRICHMENTS.keys())),
         )
 
         self.results = dict(
@@ -79,9 +136,29 @@ class JiraListProjects(JiraModuleBase):
         super(JiraListProjects, self).__init__(
             derived_arg_spec=self.module_args,
             facts_module=True,
+            list_module=True,
             rest_endpoint=REST_ENDPOINT,
         )
 
+    def fetch_enrichment(self, task):
+        (project, enrichment) = task
+        (resource, attribute) = ENRICHMENTS[enrichment]
+        endpoint = "%s/%s/%s" % (REST_ENDPOINT, project['key'], resource)
+        v = self.fetch(endpoint)
+        if v is False:
+            v = None
+        return (project, attribute, v)
+
+    def enrich(self, projects):
+        tasks = []
+        for project in projects:
+            for enrichment in self.param('enrich'):
+                tasks.append((project, enrichment))
+
+        for (project, attribute, v) in self.parallel(
+                self.fetch_enrichment, tasks):
+            project[attribute] = v
+
     def exec_module(self, **kwargs):
         query = {
             'expand': ','.join(['description', 'lead', 'url', 'projectKeys'])
@@ -96,7 +173,9 @@ class JiraListProjects(JiraModuleBase):
             if v is False:
                 del(self.results['ansible_facts']['jira_projects'])
             else:
-                self.results['ansible_facts']['jira_projects'] = v
+                self.enrich(v)
+                self.results['ansible_facts']['jira_projects'] = \
+                    self.list_fact(v)
         except Exception as e:
             self.fail(msg=e.message)
 
@@ -20,6 +20,7 @@ description:
 
 extends_documentation_fragment:
   - jira_modules_common
+  - jira_modules_list
 
 author: "Joe Topjian <joe@topjian.net>"
 """
@@ -35,6 +36,7 @@ ansible_facts:
       type: list
         - Maps Jira roles to a non-empty list of dicts with
           project information.
+        - A dict keyed by C(index_by) instead, when it is set.
         - See
           https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/role-getProjectRoles
           for the schema.
@@ -44,6 +46,10 @@ ansible_facts:
 EXAMPLES = """
 - name: List Roles
   jira_list_roles_fact:
+
+- name: List Roles keyed by name
+  jira_list_roles_fact:
+    index_by: name
 """
 
 REST_ENDPOINT = "rest/api/2/role"
@@ -65,6 +71,7 @@ class JiraListRoles(JiraModuleBase):
         super(JiraListRoles, self).__init__(
             derived_arg_spec=self.module_args,
             facts_module=True,
+            list_module=True,
             rest_endpoint=REST_ENDPOINT,
         )
 
@@ -74,7 +81,7 @@ class JiraListRoles(JiraModuleBase):
             if v is False:
                 del(self.results['ansible_facts']['jira_roles'])
             else:
-                self.results['ansible_facts']['jira_roles'] = v
+                self.results['ansible_facts']['jira_roles'] = self.list_fact(v)
         except Exception as e:
             self.fail(msg=e.message)
 
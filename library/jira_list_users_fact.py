@@ -1,8 +1,10 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
+import time
+
 from ansible.module_utils.jira_common import JiraModuleBase
-from ansible.module_utils.six.moves.urllib.parse import urlencode
+from ansible.module_utils.jira_common import USER_SHARD_CHARACTERS
 
 __metaclass__ = type
 
@@ -21,6 +23,7 @@ description:
 
 extends_documentation_fragment:
   - jira_modules_common
+  - jira_modules_list
 
 options:
   username:
@@ -44,6 +47,33 @@ options:
     default: false
     type: bool
 
+  page_size:
+    required: false
+    description:
+      - The number of users to request per page. Pages are fetched with
+        C(startAt) until the search is exhausted.
+    default: 1000
+    type: int
+
+  search_limit:
+    required: false
+    description:
+      - The maximum number of results Jira will return for a single
+        search, regardless of paging.
+      - When a search reaches this limit, it is split into prefix
+        searches (C(a), C(b), ...) which are run concurrently and
+        deduplicated by user key. Prefixes that still reach the limit
+        are split again.
+    default: 1000
+    type: int
+
+  shard_characters:
+    required: false
+    description:
+      - The characters used to build prefix searches when a search
+        reaches C(search_limit).
+    default: abcdefghijklmnopqrstuvwxyz0123456789
+
 author: "Joe Topjian <joe@topjian.net>"
 """
 
@@ -58,10 +88,23 @@ ansible_facts:
       description:
         - Maps Jira users to a non-empty list of dicts with
           user information.
+        - A dict keyed by C(index_by) instead, when it is set.
         - See
           https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/user-findUsers
           for the schema.
       returned: When Jira users are detected.
+
+jira_users_total:
+  type: int
+  description:
+    - The number of unique users found.
+  returned: always
+
+jira_users_elapsed:
+  type: float
+  description:
+    - The time, in seconds, taken to enumerate the users.
+  returned: always
 """
 
 EXAMPLES = """
@@ -70,6 +113,11 @@ EXAMPLES = """
     jira_url: '{{ server }}'
     jira_username: '{{ user }}'
     jira_password: '{{ pass }}'
+
+- name: List all active and inactive users
+  jira_list_users_fact:
+    include_inactive: true
+    concurrency: 16
 """
 
 REST_ENDPOINT = "rest/api/2/user/search"
@@ -80,18 +128,15 @@ class JiraListUsers(JiraModuleBase):
 
     def __init__(self):
         self.module_args = dict(
-            username=dict(required=False, default='.', _jira_field='username'),
-            include_active=dict(
-                required=False,
-                type='bool',
-                default=True,
-                _jira_field='includeActive'),
+            username=dict(required=False, default='.'),
+            include_active=dict(required=False, type='bool', default=True),
+            include_inactive=dict(required=False, type='bool', default=False),
 
-            include_inactive=dict(
+            page_size=dict(required=False, type='int', default=1000),
+            search_limit=dict(required=False, type='int', default=1000),
+            shard_characters=dict(
                 required=False,
-                type='bool',
-                default=False,
-                _jira_field='includeInactive'),
+                default=USER_SHARD_CHARACTERS),
         )
 
         self.results = dict(
@@ -104,23 +149,26 @@ class JiraListUsers(JiraModuleBase):
         super(JiraListUsers, self).__init__(
             derived_arg_spec=self.module_args,
             facts_module=True,
+            list_module=True,
             rest_endpoint=REST_ENDPOINT,
         )
 
     def exec_module(self, **kwargs):
-        query = {}
-
-        for (field, jira_field) in self.jira_fields():
-            v = self.param(field)
-            if v is not None:
-                query[jira_field] = v
+        start = time.time()
 
         try:
-            v = self.get(urlencode(query))
-            if v is False:
-                del(self.results['ansible_facts']['jira_users'])
-            else:
-                self.results['ansible_facts']['jira_users'] = v
+            users = self.enumerate_users(
+                username=self.param('username'),
+                include_active=self.param('include_active'),
+                include_inactive=self.param('include_inactive'),
+                page_size=self.param('page_size'),
+                search_limit=self.param('search_limit'),
+                shard_characters=self.param('shard_characters'))
+
+            self.results['ansible_facts']['jira_users'] = \
+                self.list_fact(users)
+            self.results['jira_users_total'] = len(users)
+            self.results['jira_users_elapsed'] = round(time.time() - start, 3)
         except Exception as e:
             self.fail(msg=e.message)
 
@@ -20,6 +20,7 @@ description:
 
 extends_documentation_fragment:
   - jira_modules_common
+  - jira_modules_list
 
 author: "Joe Topjian <joe@topjian.net>"
 """
@@ -35,6 +36,7 @@ ansible_facts:
       description:
         - Maps Jira workflows to a non-empty list of dicts with
           workflow information.
+        - A dict keyed by C(index_by) instead, when it is set.
         - See
           https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/workflow-getAllWorkflows
           for the schema.
@@ -65,6 +67,7 @@ class JiraListWorkflows(JiraModuleBase):
         super(JiraListWorkflows, self).__init__(
             derived_arg_spec=self.module_args,
             facts_module=True,
+            list_module=True,
             rest_endpoint=REST_ENDPOINT,
         )
 
@@ -74,7 +77,8 @@ class JiraListWorkflows(JiraModuleBase):
             if v is False:
                 del(self.results['ansible_facts']['jira_workflows'])
             else:
-                self.results['ansible_facts']['jira_workflows'] = v
+                self.results['ansible_facts']['jira_workflows'] = \
+                    self.list_fact(v)
         except Exception as e:
             self.fail(msg=e.message)
 
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 from ansible.module_utils.jira_common import JiraModuleBase
+from ansible.module_utils.jira_resources import JiraProjects, PROJECT_ARGS
 from ansible.module_utils.six.moves.urllib.parse import urlencode
 
 __metaclass__ = type
@@ -21,18 +22,21 @@ description:
 
 extends_documentation_fragment:
   - jira_modules_common
+  - jira_modules_write
 
 options:
   name:
-    required: true
+    required: false
     description:
       - The name of the project.
+      - Required when C(state) is C(present), unless C(projects) is set.
       - Cannot be updated.
 
   key:
-    required: true
+    required: false
     description:
       - The Jira key for the project.
+      - Required unless C(projects) is set.
       - Cannot be updated.
 
   project_type_key:
@@ -69,9 +73,10 @@ options:
       - Can be updated.
 
   lead:
-    required: true
+    required: false
     description:
       - A username of the project lead.
+      - Required when C(state) is C(present), unless C(projects) is set.
       - Can be updated.
 
   url:
@@ -116,6 +121,35 @@ options:
       - The ID of the category to use.
       - Can be updated.
 
+  category_name:
+    required: false
+    description:
+      - The name of the category to use, resolved to its ID.
+      - Can be updated.
+      - Cannot be used with C(category_id).
+
+  state:
+    required: false
+    description:
+      - Whether the project should exist or not.
+    choices:
+      - absent
+      - present
+    default: present
+
+  projects:
+    required: false
+    description:
+      - Manage many projects in one task instead of a single one.
+      - Each item is a dict taking the same parameters as the module,
+        except C(projects).
+      - The current state of all projects is read with one listing plus
+        concurrent scheme reads, compared in memory, and the required
+        creates, updates and deletes are run concurrently, bounded by
+        C(concurrency).
+      - This parameter is mutually exclusive with C(name) and C(key).
+    type: list
+
 author: "Joe Topjian <joe@topjian.net>"
 """
 
@@ -127,13 +161,43 @@ jira_project:
     - See
       https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/project-getProject
       for the schema.
-  returned: When a Jira project was detected.
+  returned: When a Jira project was detected and C(projects) is not set.
+
+jira_project_actions:
+  type: dict
+  description:
+    - Maps the key of every project in C(projects) to the action taken,
+      C(created), C(updated), C(deleted) or null.
+  returned: When C(projects) is set.
+
+jira_project_errors:
+  type: dict
+  description:
+    - Maps the key of every project in C(projects) that could not be
+      changed to the error returned by Jira.
+  returned: When changes to some projects in C(projects) failed.
 """
 
 EXAMPLES = """
 - name: Ensure project exists
   jira_project:
     name: project_1
+
+- name: Ensure many projects are in the desired state
+  jira_project:
+    projects:
+      - name: Project 1
+        key: PRJ1
+        project_type_key: business
+        lead: admin
+        permission_scheme: 10000
+      - name: Project 2
+        key: PRJ2
+        project_type_key: software
+        lead: jdoe
+      - key: OLD
+        state: absent
+    concurrency: 16
 """
 
 REST_ENDPOINT = "rest/api/2/project"
@@ -144,72 +208,14 @@ class JiraProject(JiraModuleBase):
 
     def __init__(self):
         self.module_args = dict(
-            name=dict(
-                required=True,
-                _jira_field='name',
-                _jira_update=False),
-
-            key=dict(
-                required=True,
-                _jira_field='key',
-                _jira_update=False),
-
-            project_type_key=dict(
-                _jira_field='projectTypeKey',
-                _jira_update=False),
-
-            project_template_key=dict(
-                _jira_field='projectTemplateKey',
-                _jira_update=False),
-
-            description=dict(
-                _jira_field='description',
-                _jira_update=True),
-
-            lead=dict(
-                required=True,
-                _jira_field='lead',
-                _jira_update=True),
-
-            url=dict(
-                _jira_field='url',
-                _jira_update=True),
-
-            avatar_id=dict(
-                type='int',
-                _jira_field='avatarId',
-                _jira_update=True),
-
-            issue_security_scheme=dict(
-                type='int',
-                _jira_field='issueSecurityScheme',
-                _jira_update=True),
-
-            permission_scheme=dict(
-                type='int',
-                _jira_field='permissionScheme',
-                _jira_update=True),
-
-            notification_scheme=dict(
-                type='int',
-                _jira_field='notificationScheme',
-                _jira_update=True),
-
-            workflow_scheme_id=dict(
-                type='int',
-                _jira_field='workflowSchemeId',
-                _jira_update=False),
-
-            category_id=dict(
-                _jira_field='categoryId',
-                _jira_update=True),
-
-            state=dict(
-                required=False,
-                default='present',
-                choices=['absent', 'present']),
+            PROJECT_ARGS,
+            projects=dict(
+                type='list',
+                required=False),
         )
 
+        self.resource = JiraProjects(self, PROJECT_ARGS)
+
         self.results = dict(
             jira_project=dict(),
             changed=False,
@@ -217,14 +223,25 @@ class JiraProject(JiraModuleBase):
 
         super(JiraProject, self).__init__(
             derived_arg_spec=self.module_args,
-            mutually_exclusive=[['project_type_key', 'project_template_key']],
-            required_one_of=[['project_type_key', 'project_template_key']],
+            write_module=True,
+            mutually_exclusive=[
+                ['project_type_key', 'project_template_key'],
+                ['category_id', 'category_name'],
+                ['projects', 'name'], ['projects', 'key']],
+            required_one_of=[['key', 'projects']],
             rest_endpoint=REST_ENDPOINT,
         )
 
     def exec_module(self, **kwargs):
+        if self.param('projects') is not None:
+            self.exec_resource(
+                self.resource, self.param('projects'), 'projects',
+                'jira_project')
+            return
+
         action = None
-        is_install_mode = self.param('state') == 'present'
+        params = self.module.params
+        is_install_mode = params['state'] == 'present'
 
         q = {
             'expand': ','.join(['description', 'lead', 'url', 'projectKeys'])
@@ -233,9 +250,12 @@ class JiraProject(JiraModuleBase):
 
         update_dict = {}
 
-        project_endpoint = "%s/%s" % (REST_ENDPOINT, self.param('key'))
+        project_endpoint = "%s/%s" % (REST_ENDPOINT, params['key'])
 
         try:
+            self.resource.validate(params)
+            self.resource.resolve_category(params)
+
             self.rest_endpoint = project_endpoint
             project = self.get(query)
 
@@ -248,75 +268,9 @@ class JiraProject(JiraModuleBase):
                     action = 'created'
                 else:
                     # Detect updates
-                    for (v, jira_field) in self.jira_update_fields():
-                        if jira_field in project:
-                            if jira_field == "lead":
-                                lead = self.param(v)
-                                _lead = project[jira_field]['name']
-                                if lead != _lead:
-                                    update_dict[jira_field] = lead
-                                    update_dict['assigneeType'] = \
-                                        'PROJECT_LEAD'
-                                continue
-
-                            if jira_field == "description":
-                                desc = self.param(v)
-                                _desc = project[jira_field]
-                                if desc is None and _desc == "":
-                                    continue
-                                if desc != _desc:
-                                    if _desc is None:
-                                        update_dict[jira_field] = ""
-                                    else:
-                                        update_dict[jira_field] = self.param(v)
-                                continue
-
-                            if self.param(v) != project[jira_field]:
-                                update_dict[jira_field] = self.param(v)
-
-                        if v == "workflow_scheme_id":
-                            if self.param(v) is None:
-                                continue
-
-                            self.rest_endpoint = "%s/%s/workflowscheme" % (
-                                REST_ENDPOINT, self.param('key'))
-                            workflow_scheme = self.get()
-                            workflow_scheme_id = workflow_scheme['id']
-                            if self.param(v) != workflow_scheme_id:
-                                update_dict[jira_field] = self.param(v)
-
-                        if v == "issue_security_scheme":
-                            if self.param(v) is None:
-                                continue
-                            self.rest_endpoint = \
-                                "%s/%s/issuesecuritylevelscheme" % (
-                                    REST_ENDPOINT, self.param('key'))
-                            iss = self.get()
-                            iss_id = iss['id']
-                            if self.param(v) != iss_id:
-                                update_dict[jira_field] = self.param(v)
-
-                        if v == "notification_scheme":
-                            if self.param(v) is None:
-                                continue
-                            self.rest_endpoint = \
-                                "%s/%s/notificationscheme" % (
-                                    REST_ENDPOINT, self.param('key'))
-                            ns = self.get()
-                            ns_id = ns['id']
-                            if self.param(v) != ns_id:
-                                update_dict[jira_field] = self.param(v)
-
-                        if v == "permission_scheme":
-                            if self.param(v) is None:
-                                continue
-                            self.rest_endpoint = \
-                                "%s/%s/permissionscheme" % (
-                                    REST_ENDPOINT, self.param('key'))
-                            ps = self.get()
-                            ps_id = ps['id']
-                            if self.param(v) != ps_id:
-                                update_dict[jira_field] = self.param(v)
+                    scheme_ids = self.resource.get_scheme_ids(params)
+                    update_dict = self.resource.detect_updates(
+                        params, project, scheme_ids)
 
                     if len(update_dict) > 0:
                         action = 'updated'
@@ -330,24 +284,22 @@ class JiraProject(JiraModuleBase):
                 return
 
             if action == 'created':
-                data = {}
-                for (v, jira_field) in self.jira_fields():
-                    if self.param(v):
-                        data[jira_field] = self.param(v)
-                data['assigneeType'] = 'PROJECT_LEAD'
+                data = self.resource.create_data(params)
 
                 self.rest_endpoint = REST_ENDPOINT
-                self.post(data)
+                project = self.post(data)
 
                 self.rest_endpoint = project_endpoint
-                project = self.get(query)
+                project = self.write_result(
+                    project, lambda: self.get(query), 'name')
                 self.results['jira_project'] = project
                 return
 
             if action == 'updated':
                 self.rest_endpoint = project_endpoint
                 project = self.put(update_dict)
-                project = self.get(query)
+                project = self.write_result(
+                    project, lambda: self.get(query), 'name')
                 self.results['jira_project'] = project
                 return
 
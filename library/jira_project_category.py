@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 
 from ansible.module_utils.jira_common import JiraModuleBase
+from ansible.module_utils.jira_resources import JiraProjectCategories
+from ansible.module_utils.jira_resources import PROJECT_CATEGORY_ARGS
 
 __metaclass__ = type
 
@@ -17,16 +19,19 @@ version_added: "0.0.1"
 short_description: manage a project category in Jira
 description:
   - Manage a project category in Jira
+  - Several project categories can be managed in one task with C(categories).
 
 extends_documentation_fragment:
   - jira_modules_common
+  - jira_modules_write
 
 options:
   name:
-    required: true
+    required: false
     description:
       - The name of the project category.
       - Cannot be updated.
+      - Required unless C(categories) is set.
 
   description:
     required: false
@@ -34,6 +39,26 @@ options:
       - The description of the project category
       - Can be updated.
 
+  state:
+    required: false
+    description:
+      - Whether the project category should exist or not.
+    default: present
+    choices:
+      - absent
+      - present
+
+  categories:
+    required: false
+    type: list
+    description:
+      - A list of project categories to manage. Each item is a dict taking
+        the same parameters as this module, except C(categories).
+      - Parameters missing from an item take their default value.
+      - The project categories are read once and diffed in memory. Only the
+        changes are applied, concurrently.
+      - Cannot be used with C(name).
+
 author: "Joe Topjian <joe@topjian.net>"
 """
 
@@ -46,6 +71,19 @@ jira_project:
       https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/projectCategory-getProjectCategoryById
       for the schema.
   returned: When a Jira project category was detected.
+
+jira_project_category_actions:
+  type: dict
+  description:
+    - Maps the name of every item of C(categories) to the action taken.
+  returned: When C(categories) is set.
+
+jira_project_category_errors:
+  type: dict
+  description:
+    - Maps the name of every item of C(categories) that could not be changed to
+      the error returned by Jira.
+  returned: When changes to some items of C(categories) failed.
 """
 
 EXAMPLES = """
@@ -53,6 +91,16 @@ EXAMPLES = """
   jira_project_category:
     name: Internal Projects
     description: A category for internal projects
+
+- name: Ensure several project categories exist
+  jira_project_category:
+    categories:
+      - name: Project Category 1
+        description: The first project category
+      - name: Project Category 2
+        description: The second project category
+      - name: Project Category 3
+        state: absent
 """
 
 REST_ENDPOINT = "rest/api/2/projectCategory"
@@ -63,22 +111,14 @@ class JiraProjectCategory(JiraModuleBase):
 
     def __init__(self):
         self.module_args = dict(
-            name=dict(
-                required=True,
-                _jira_field='name',
-                _jira_update=False),
-
-            description=dict(
-                required=False,
-                _jira_field='description',
-                _jira_update=True),
-
-            state=dict(
-                required=False,
-                default='present',
-                choices=['absent', 'present']),
+            PROJECT_CATEGORY_ARGS,
+            categories=dict(
+                type='list',
+                required=False),
         )
 
+        self.resource = JiraProjectCategories(self, PROJECT_CATEGORY_ARGS)
+
         self.results = dict(
             jira_project_category=dict(),
             changed=False,
@@ -86,34 +126,26 @@ class JiraProjectCategory(JiraModuleBase):
 
         super(JiraProjectCategory, self).__init__(
             derived_arg_spec=self.module_args,
+            write_module=True,
             rest_endpoint=REST_ENDPOINT,
+            mutually_exclusive=[['categories', 'name']],
+            required_one_of=[['categories', 'name']],
         )
 
-    def find_id(self):
-        self.rest_endpoint = REST_ENDPOINT
-        cats = self.get()
-        name = self.param('name')
-
-        id = None
-        for cat in cats:
-            if cat["name"] == name:
-                id = cat["id"]
-
-        return id
-
     def exec_module(self, **kwargs):
+        if self.param('categories') is not None:
+            self.exec_resource(
+                self.resource, self.param('categories'), 'categories',
+                'jira_project_category')
+            return
+
         action = None
         is_install_mode = self.param('state') == 'present'
 
         update_dict = {}
 
         try:
-            id = self.find_id()
-            if id is None:
-                pcat = False
-            else:
-                self.rest_endpoint = "%s/%s" % (REST_ENDPOINT, id)
-                pcat = self.get()
+            (id, pcat) = self.read_named(REST_ENDPOINT, self.param('name'))
 
             if not is_install_mode:
                 if pcat is False:
@@ -123,11 +155,8 @@ class JiraProjectCategory(JiraModuleBase):
                 if pcat is False:
                     action = 'created'
                 else:
-                    # Detect updates
-                    for (v, jira_field) in self.jira_update_fields():
-                        if jira_field in pcat:
-                            if self.param(v) != pcat[jira_field]:
-                                update_dict[jira_field] = self.param(v)
+                    update_dict = self.resource.detect_updates(
+                        self.module.params, pcat)
 
                     if len(update_dict) > 0:
                         action = 'updated'
@@ -146,34 +175,23 @@ class JiraProjectCategory(JiraModuleBase):
                 return
 
             if action == 'created':
-                data = {}
-                for (v, jira_field) in self.jira_fields():
-                    if self.param(v):
-                        data[jira_field] = self.param(v)
-
                 self.rest_endpoint = REST_ENDPOINT
-                pcat = self.post(data)
+                pcat = self.post(self.resource.create_data(self.module.params))
+                self.invalidate_ids(REST_ENDPOINT)
                 self.results['jira_project_category'] = pcat
                 return
 
             if action == 'updated':
-                id = self.find_id()
-                if id is None:
-                    self.fail("Unable to find Jira project category %s" % (
-                        self.param('name')))
                 self.rest_endpoint = "%s/%s" % (REST_ENDPOINT, id)
                 pcat = self.put(update_dict)
-                pcat = self.get()
+                pcat = self.write_result(pcat, self.get, 'name')
                 self.results['jira_project_category'] = pcat
                 return
 
             if action == 'deleted':
-                id = self.find_id()
-                if id is None:
-                    self.fail("Unable to find Jira project category %s" % (
-                        self.param('name')))
                 self.rest_endpoint = "%s/%s" % (REST_ENDPOINT, id)
                 self.delete()
+                self.invalidate_ids(REST_ENDPOINT)
                 return
 
         except Exception as e:
@@ -1,7 +1,10 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
-from ansible.module_utils.jira_common import JiraModuleBase
+from ansible.module_utils.jira_common import JiraModuleBase, JiraModuleError
+from ansible.module_utils.jira_resources import JiraProjectRoleMemberships
+from ansible.module_utils.jira_resources import ACTOR_TYPES
+from ansible.module_utils.jira_resources import PROJECT_ROLE_MEMBERSHIP_ARGS
 
 __metaclass__ = type
 
@@ -17,9 +20,14 @@ version_added: "0.0.1"
 short_description: manage a project role membership in Jira
 description:
   - Manage a project role membership in Jira
+  - Only the users and groups which differ are added or removed, the
+    requests being sent concurrently.
+  - The memberships of many projects and roles can be managed in one task
+    with C(memberships).
 
 extends_documentation_fragment:
   - jira_modules_common
+  - jira_modules_write
 
 options:
   project_key:
@@ -55,12 +63,49 @@ options:
     description:
       - Users to belong to the role
       - Can be updated.
+      - When not set, the users of the role are not managed.
 
   groups:
     required: false
     description:
       - Groups to belong to the role
       - Can be updated.
+      - When not set, the groups of the role are not managed.
+
+  memberships:
+    required: false
+    description:
+      - Maps project keys to dicts mapping role names to the C(users) and
+        C(groups) to belong to the role in the project.
+      - Role IDs are resolved once, the current memberships of all pairs
+        are read concurrently, and only the changes are applied, through
+        one worker pool.
+      - C(state) applies to every pair.
+      - Cannot be used with C(project_id), C(project_key), C(role_name),
+        C(role_id), C(users) or C(groups).
+    type: dict
+
+  state:
+    required: false
+    description:
+      - With C(absent), all users and groups are removed from the role.
+    default: present
+    choices:
+      - absent
+      - present
+
+  result_refresh:
+    required: false
+    description:
+      - How the membership returned after an update is obtained.
+      - C(full) reads the membership again from Jira.
+      - C(from_response) and C(none) return the membership which follows
+        from the changes applied, without reading it again.
+    choices:
+      - full
+      - from_response
+      - none
+    default: from_response
 
 author: "Joe Topjian <joe@topjian.net>"
 """
@@ -74,6 +119,34 @@ jira_project_role_membership:
       https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/project/{projectIdOrKey}/role-getProjectRole
       for the schema.
   returned: When a Jira project role membership was detected.
+
+jira_project_role_membership_added:
+  type: int
+  description:
+    - The number of users and groups added to the role.
+    - With C(memberships), the total over all pairs.
+  returned: always
+
+jira_project_role_membership_removed:
+  type: int
+  description:
+    - The number of users and groups removed from the role.
+    - With C(memberships), the total over all pairs.
+  returned: always
+
+jira_project_role_membership_actions:
+  type: dict
+  description:
+    - Maps each project key of C(memberships) to a dict mapping its role
+      names to the action taken.
+  returned: When C(memberships) is set.
+
+jira_project_role_membership_errors:
+  type: dict
+  description:
+    - Maps each C(project/role) pair of C(memberships) whose changes
+      could not all be applied to the errors returned by Jira.
+  returned: When changes to some pairs in C(memberships) failed.
 """
 
 EXAMPLES = """
@@ -83,6 +156,22 @@ EXAMPLES = """
     role_name: Administrators
     users:
       - admin
+
+- name: Ensure the memberships of several projects
+  jira_project_role_membership:
+    memberships:
+      PRJ1:
+        Administrators:
+          users:
+            - admin
+        Developers:
+          groups:
+            - developers
+      PRJ2:
+        Administrators:
+          users:
+            - admin
+          groups: []
 """
 
 ROLE_REST_ENDPOINT = "rest/api/2/role"
@@ -94,9 +183,9 @@ class JiraProjectCategory(JiraModuleBase):
 
     def __init__(self):
         self.module_args = dict(
-            project_name=dict(
+            project_id=dict(
                 required=False,
-                _jira_field='project_name',
+                _jira_field='project_id',
                 _jira_update=False),
 
             project_key=dict(
@@ -130,113 +219,117 @@ class JiraProjectCategory(JiraModuleBase):
                 required=False,
                 default='present',
                 choices=['absent', 'present']),
+
+            memberships=dict(
+                type='dict',
+                required=False),
+
+            # The membership follows from the applied changes, so it is
+            # only read again when asked for.
+            result_refresh=dict(
+                required=False,
+                default='from_response',
+                choices=['full', 'from_response', 'none']),
         )
 
+        self.resource = JiraProjectRoleMemberships(
+            self, PROJECT_ROLE_MEMBERSHIP_ARGS)
+
         self.results = dict(
             jira_project_role_membership=dict(),
+            jira_project_role_membership_added=0,
+            jira_project_role_membership_removed=0,
             changed=False,
         )
 
         super(JiraProjectCategory, self).__init__(
             derived_arg_spec=self.module_args,
+            write_module=True,
             rest_endpoint=REST_ENDPOINT,
             mutually_exclusive=[
-                ['project_id', 'project_key'], ['role_id', 'role_name']],
+                ['project_id', 'project_key'], ['role_id', 'role_name'],
+                ['memberships', 'project_id'], ['memberships', 'project_key'],
+                ['memberships', 'role_id'], ['memberships', 'role_name'],
+                ['memberships', 'users'], ['memberships', 'groups']],
             required_one_of=[
-                ['project_id', 'project_key'], ['role_id', 'role_name']],
+                ['project_id', 'project_key', 'memberships'],
+                ['role_id', 'role_name', 'memberships']],
         )
 
     def find_role_id(self):
-        self.rest_endpoint = ROLE_REST_ENDPOINT
-        roles = self.get()
-        name = self.param('role_name')
-
-        id = None
-        for role in roles:
-            if role["name"] == name:
-                id = role["id"]
-
+        (id, role) = self.read_named(
+            ROLE_REST_ENDPOINT, self.param('role_name'))
         return id
 
-    def get_users_and_groups(self):
-        users = []
-        groups = []
-        actors = self.get()
-        for actor in actors['actors']:
-            if actor['type'] == 'atlassian-user-role-actor':
-                users.append(actor['name'])
-            if actor['type'] == 'atlassian-group-role-actor':
-                groups.append(actor['name'])
-        return (users, groups)
+    def get_users_and_groups(self, actors=None):
+        if actors is None:
+            actors = self.get()
+        return self.resource.actor_names(actors)
 
     def exec_module(self, **kwargs):
+        if self.param('memberships') is not None:
+            self.exec_matrix(self.param('memberships'))
+            return
+
         action = None
-        is_install_mode = self.param('state') == 'present'
 
         try:
             prj = self.param('project_key')
             if prj is None:
-                prj = self.param('project_key')
+                prj = self.param('project_id')
 
             role_id = self.param('role_id')
             if role_id is None:
                 role_id = self.find_role_id()
                 if role_id is None:
-                    self.fail("Unable to determine Jira role id: %s",
-                              self.param('role_name'))
+                    raise JiraModuleError(
+                        "Unable to determine Jira role id: %s" % (
+                            self.param('role_name')))
 
             self.rest_endpoint = REST_ENDPOINT % (prj, role_id)
 
-            users = self.param('users')
-            groups = self.param('groups')
             (_users, _groups) = self.get_users_and_groups()
-
-            if not is_install_mode:
-                action = 'deleted'
-
-                if len(users) == 0 and len(_users) == 0 and \
-                   len(groups) == 0 and len(_groups) == 0:
-                    action = None
-            else:
-                if (set(users) != set(_users)) or \
-                   (set(groups) != set(_groups)):
-                    action = 'updated'
-
-            self.results['jira_project_role_membership_action'] = action
-
-            if len(users) == 0 and len(groups) == 0:
-                del(self.results['jira_project_role_membership'])
-
-            if action is not None:
+            changes = self.resource.diff_actors(
+                self.param('users'), self.param('groups'), _users, _groups,
+                self.param('state'))
+
+            if len(changes) > 0:
+                action = 'updated'
+                if self.param('state') == 'absent':
+                    action = 'deleted'
                 self.results['changed'] = True
 
-            if self.check_mode:
-                return
-
-            if action == 'updated' or action == 'deleted':
-                data = dict()
-                key = 'categorisedActors'
-                data[key] = dict()
-
-                gKey = 'atlassian-group-role-actor'
-                uKey = 'atlassian-user-role-actor'
-
-                if action == 'deleted':
-                    data[key][gKey] = []
-                    data[key][uKey] = []
-
-                if action == 'updated':
-                    if len(groups) > 0:
-                        data[key][gKey] = groups
-
-                    if len(users) > 0:
-                        data[key][uKey] = users
-
-                self.put(data)
+            added = [c for c in changes if c[0] == 'POST']
+            self.results['jira_project_role_membership_action'] = action
+            self.results['jira_project_role_membership_added'] = len(added)
+            self.results['jira_project_role_membership_removed'] = \
+                len(changes) - len(added)
+
+            if not self.check_mode and len(changes) > 0:
+                requests = self.resource.change_requests(
+                    self.rest_endpoint, changes)
+                outcomes = self.parallel(self.resource.send, requests)
+                errors = [e for e in outcomes if e is not None]
+                if len(errors) > 0:
+                    raise JiraModuleError(', '.join(errors))
+
+                # The resulting actors follow from the applied changes.
+                for (method, actor_type, name) in changes:
+                    current = _users if actor_type == 'user' else _groups
+                    if method == 'POST':
+                        current.append(name)
+                    else:
+                        current.remove(name)
+
+                actors = {'actors': [
+                    dict(type=ACTOR_TYPES[t], name=n)
+                    for (t, names) in [('user', _users), ('group', _groups)]
+                    for n in names]}
+                actors = self.write_result(actors, self.get, 'actors')
+                (_users, _groups) = self.get_users_and_groups(actors)
 
-            (_users, _groups) = self.get_users_and_groups()
             if len(_users) == 0 and len(_groups) == 0:
-                del(self.results['jira_project_role_membership'])
+                self.results.pop('jira_project_role_membership', None)
             else:
                 v = {
                     'users': _users,
@@ -248,6 +341,95 @@ class JiraProjectCategory(JiraModuleBase):
         except Exception as e:
             self.fail(msg=e.message)
 
+    def matrix_pairs(self, memberships):
+        """Validate memberships, returning (project, role, actors) tuples."""
+        pairs = []
+        for prj in sorted(memberships):
+            roles = memberships[prj]
+            if not isinstance(roles, dict):
+                raise JiraModuleError(
+                    "The roles of project %s must be a dict" % (prj))
+
+            for role_name in sorted(roles):
+                actors = roles[role_name] or {}
+                if not isinstance(actors, dict):
+                    raise JiraModuleError(
+                        "The actors of role %s in project %s must be a "
+                        "dict" % (role_name, prj))
+
+                for field in actors:
+                    if field not in ['users', 'groups']:
+                        raise JiraModuleError(
+                            "Unsupported parameter for role %s in project "
+                            "%s: %s" % (role_name, prj, field))
+                    if not isinstance(actors[field], list):
+                        raise JiraModuleError(
+                            "%s of role %s in project %s must be a list" % (
+                                field, role_name, prj))
+
+                pairs.append((prj, role_name, actors))
+
+        return pairs
+
+    def exec_matrix(self, memberships):
+        try:
+            pairs = self.matrix_pairs(memberships)
+
+            current = self.resource.read(
+                [(prj, role_name) for (prj, role_name, actors) in pairs])
+        except Exception as e:
+            self.fail(msg=e.message)
+
+        del(self.results['jira_project_role_membership'])
+
+        actions = {}
+        requests = []
+        owners = []
+        added = 0
+        removed = 0
+        for ((prj, role_name, actors), (endpoint, _users, _groups)) in \
+                zip(pairs, current):
+            changes = self.resource.diff_actors(
+                actors.get('users'), actors.get('groups'), _users, _groups,
+                self.param('state'))
+
+            action = None
+            if len(changes) > 0:
+                action = 'updated'
+                if self.param('state') == 'absent':
+                    action = 'deleted'
+                self.results['changed'] = True
+            actions.setdefault(prj, {})[role_name] = action
+
+            n = len([c for c in changes if c[0] == 'POST'])
+            added += n
+            removed += len(changes) - n
+
+            for request in self.resource.change_requests(endpoint, changes):
+                requests.append(request)
+                owners.append((prj, role_name))
+
+        self.results['jira_project_role_membership_actions'] = actions
+        self.results['jira_project_role_membership_added'] = added
+        self.results['jira_project_role_membership_removed'] = removed
+
+        if self.check_mode:
+            return
+
+        errors = {}
+        for ((prj, role_name), error) in \
+                zip(owners, self.parallel(self.resource.send, requests)):
+            if error is not None:
+                errors.setdefault("%s/%s" % (prj, role_name), []).append(error)
+
+        if len(errors) > 0:
+            self.fail(
+                msg="Failed to update %s project role membership(s)" % (
+                    len(errors)),
+                jira_project_role_membership_errors=dict(
+                    (k, ', '.join(v)) for (k, v) in errors.items()),
+                **self.results)
+
 
 if __name__ == '__main__':
     JiraProjectCategory()
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 from ansible.module_utils.jira_common import JiraModuleBase
+from ansible.module_utils.jira_resources import JiraRoles, ROLE_ARGS
 
 __metaclass__ = type
 
@@ -17,16 +18,19 @@ version_added: "0.0.1"
 short_description: manage a role in Jira
 description:
   - Manage a role in Jira
+  - Several roles can be managed in one task with C(roles).
 
 extends_documentation_fragment:
   - jira_modules_common
+  - jira_modules_write
 
 options:
   name:
-    required: true
+    required: false
     description:
       - The name of the role.
       - Cannot be updated.
+      - Required unless C(roles) is set.
 
   description:
     required: false
@@ -34,6 +38,26 @@ options:
       - The description of the role.
       - Can be updated.
 
+  state:
+    required: false
+    description:
+      - Whether the role should exist or not.
+    default: present
+    choices:
+      - absent
+      - present
+
+  roles:
+    required: false
+    type: list
+    description:
+      - A list of roles to manage. Each item is a dict taking the same
+        parameters as this module, except C(roles).
+      - Parameters missing from an item take their default value.
+      - The roles are read once and diffed in memory. Only the changes are
+        applied, concurrently.
+      - Cannot be used with C(name).
+
 author: "Joe Topjian <joe@topjian.net>"
 """
 
@@ -46,6 +70,19 @@ jira_role:
       https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/role-getProjectRolesById
       for the schema.
   returned: When a Jira role was detected.
+
+jira_role_actions:
+  type: dict
+  description:
+    - Maps the name of every item of C(roles) to the action taken.
+  returned: When C(roles) is set.
+
+jira_role_errors:
+  type: dict
+  description:
+    - Maps the name of every item of C(roles) that could not be changed to
+      the error returned by Jira.
+  returned: When changes to some items of C(roles) failed.
 """
 
 EXAMPLES = """
@@ -53,6 +90,16 @@ EXAMPLES = """
   jira_role:
     name: Some Role
     description: A role
+
+- name: Ensure several roles exist
+  jira_role:
+    roles:
+      - name: Role 1
+        description: The first role
+      - name: Role 2
+        description: The second role
+      - name: Role 3
+        state: absent
 """
 
 REST_ENDPOINT = "rest/api/2/role"
@@ -63,22 +110,14 @@ class JiraRole(JiraModuleBase):
 
     def __init__(self):
         self.module_args = dict(
-            name=dict(
-                required=True,
-                _jira_field='name',
-                _jira_update=False),
-
-            description=dict(
-                required=False,
-                _jira_field='description',
-                _jira_update=True),
-
-            state=dict(
-                required=False,
-                default='present',
-                choices=['absent', 'present']),
+            ROLE_ARGS,
+            roles=dict(
+                type='list',
+                required=False),
         )
 
+        self.resource = JiraRoles(self, ROLE_ARGS)
+
         self.results = dict(
             jira_role=dict(),
             changed=False,
@@ -86,34 +125,25 @@ class JiraRole(JiraModuleBase):
 
         super(JiraRole, self).__init__(
             derived_arg_spec=self.module_args,
+            write_module=True,
             rest_endpoint=REST_ENDPOINT,
+            mutually_exclusive=[['roles', 'name']],
+            required_one_of=[['roles', 'name']],
         )
 
-    def find_id(self):
-        self.rest_endpoint = REST_ENDPOINT
-        roles = self.get()
-        name = self.param('name')
-
-        id = None
-        for role in roles:
-            if role["name"] == name:
-                id = role["id"]
-
-        return id
-
     def exec_module(self, **kwargs):
+        if self.param('roles') is not None:
+            self.exec_resource(
+                self.resource, self.param('roles'), 'roles', 'jira_role')
+            return
+
         action = None
         is_install_mode = self.param('state') == 'present'
 
         update_dict = {}
 
         try:
-            id = self.find_id()
-            if id is None:
-                role = False
-            else:
-                self.rest_endpoint = "%s/%s" % (REST_ENDPOINT, id)
-                role = self.get()
+            (id, role) = self.read_named(REST_ENDPOINT, self.param('name'))
 
             if not is_install_mode:
                 if role is False:
@@ -123,11 +153,8 @@ class JiraRole(JiraModuleBase):
                 if role is False:
                     action = 'created'
                 else:
-                    # Detect updates
-                    for (v, jira_field) in self.jira_update_fields():
-                        if jira_field in role:
-                            if self.param(v) != role[jira_field]:
-                                update_dict[jira_field] = self.param(v)
+                    update_dict = self.resource.detect_updates(
+                        self.module.params, role)
 
                     if len(update_dict) > 0:
                         action = 'updated'
@@ -146,34 +173,23 @@ class JiraRole(JiraModuleBase):
                 return
 
             if action == 'created':
-                data = {}
-                for (v, jira_field) in self.jira_fields():
-                    if self.param(v):
-                        data[jira_field] = self.param(v)
-
                 self.rest_endpoint = REST_ENDPOINT
-                role = self.post(data)
+                role = self.post(self.resource.create_data(self.module.params))
+                self.invalidate_ids(REST_ENDPOINT)
                 self.results['jira_role'] = role
                 return
 
             if action == 'updated':
-                id = self.find_id()
-                if id is None:
-                    self.fail("Unable to find Jira role %s" % (
-                        self.param('name')))
                 self.rest_endpoint = "%s/%s" % (REST_ENDPOINT, id)
                 role = self.post(update_dict)
-                role = self.get()
+                role = self.write_result(role, self.get, 'name')
                 self.results['jira_role'] = role
                 return
 
             if action == 'deleted':
-                id = self.find_id()
-                if id is None:
-                    self.fail("Unable to find Jira role %s" % (
-                        self.param('name')))
                 self.rest_endpoint = "%s/%s" % (REST_ENDPOINT, id)
                 self.delete()
+                self.invalidate_ids(REST_ENDPOINT)
                 return
 
         except Exception as e:
@@ -0,0 +1,301 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from ansible.module_utils.jira_common import JiraModuleBase, JiraModuleError
+from ansible.module_utils.jira_resources import JiraGroups, GROUP_ARGS
+from ansible.module_utils.jira_resources import JiraUsers, USER_ARGS
+from ansible.module_utils.jira_resources import JiraRoles, ROLE_ARGS
+from ansible.module_utils.jira_resources import JiraProjectCategories
+from ansible.module_utils.jira_resources import PROJECT_CATEGORY_ARGS
+from ansible.module_utils.jira_resources import JiraProjects, PROJECT_ARGS
+from ansible.module_utils.jira_resources import JiraGroupMemberships
+from ansible.module_utils.jira_resources import GROUP_MEMBERSHIP_ARGS
+from ansible.module_utils.jira_resources import JiraProjectRoleMemberships
+from ansible.module_utils.jira_resources import PROJECT_ROLE_MEMBERSHIP_ARGS
+
+__metaclass__ = type
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+
+DOCUMENTATION = """
+module: jira_state
+version_added: "0.0.1"
+short_description: converge Jira to a desired-state document
+description:
+  - Converge the groups, users, roles, project categories, projects and
+    memberships of Jira to a single desired-state document.
+  - Each kind of resource is read in bulk and diffed the same way as by
+    the list mode of its module.
+  - Kinds are applied in the order of their dependencies. Group
+    memberships come after groups and users, projects after categories
+    and users, and project role memberships after projects, roles, groups
+    and users. The changes of kinds which do not depend on each other are
+    applied concurrently.
+  - Deletions are applied last, in the reverse order.
+  - A kind is not applied when a kind it depends on failed.
+
+extends_documentation_fragment:
+  - jira_modules_common
+
+options:
+  resources:
+    required: true
+    description:
+      - The desired-state document. Maps kinds of resources to lists of
+        items. Kinds which are missing are not managed.
+      - C(groups) items take the parameters of C(jira_group).
+      - C(users) items take the parameters of C(jira_user), except C(key).
+        Their passwords are hidden from the task output.
+      - C(roles) items take the parameters of C(jira_role).
+      - C(categories) items take the parameters of
+        C(jira_project_category).
+      - C(projects) items take the parameters of C(jira_project).
+        C(category_name) can name a category of the same document.
+      - C(group_memberships) items take C(group_name), C(users),
+        C(exclusive) and C(state), as C(jira_user_group_membership).
+      - C(role_memberships) items take C(project_key), C(role_name),
+        C(users), C(groups) and C(state), as
+        C(jira_project_role_membership).
+      - Parameters missing from an item take their default value.
+      - Workflow schemes are not supported, as they can only be looked up
+        by ID. Projects can still refer to one with C(workflow_scheme_id).
+    type: dict
+
+author: "Joe Topjian <joe@topjian.net>"
+"""
+
+RETURN = """
+jira_state_plan:
+  type: dict
+  description:
+    - Maps each planned kind to a dict mapping the name of each of its
+      items to the action taken.
+    - Project role memberships are named after their project key and role
+      name, as in C(PRJ/Developers).
+  returned: always
+
+jira_state_errors:
+  type: dict
+  description:
+    - Maps each kind which failed to a dict mapping the name of each item
+      which could not be changed to the error returned by Jira, or to the
+      error which prevented planning the kind.
+  returned: always
+
+jira_state_skipped:
+  type: list
+  description:
+    - The kinds which were not applied because a kind they depend on
+      failed.
+  returned: always
+"""
+
+EXAMPLES = """
+- name: Converge Jira to a state document
+  jira_state:
+    resources: "{{ lookup('file', 'jira-state.yml') | from_yaml }}"
+
+- name: Converge a team's groups, project and roles
+  jira_state:
+    resources:
+      groups:
+        - name: team-1
+      users:
+        - username: user_1
+          email_address: user_1@example.com
+          display_name: User 1
+      group_memberships:
+        - group_name: team-1
+          users:
+            - user_1
+          exclusive: true
+      categories:
+        - name: Teams
+      roles:
+        - name: Reviewers
+      projects:
+        - key: TEAM1
+          name: Team 1
+          lead: user_1
+          project_type_key: software
+          category_name: Teams
+      role_memberships:
+        - project_key: TEAM1
+          role_name: Reviewers
+          groups:
+            - team-1
+
+- name: Preview the changes of a state document
+  jira_state:
+    resources: "{{ lookup('file', 'jira-state.yml') | from_yaml }}"
+  check_mode: true
+"""
+
+# Maps each kind to its reconciler, the argument spec of its items and the
+# kinds it depends on.
+KINDS = dict(
+    groups=(JiraGroups, GROUP_ARGS, []),
+    users=(JiraUsers, USER_ARGS, []),
+    roles=(JiraRoles, ROLE_ARGS, []),
+    categories=(JiraProjectCategories, PROJECT_CATEGORY_ARGS, []),
+    group_memberships=(
+        JiraGroupMemberships, GROUP_MEMBERSHIP_ARGS, ['groups', 'users']),
+    projects=(JiraProjects, PROJECT_ARGS, ['categories', 'users']),
+    role_memberships=(
+        JiraProjectRoleMemberships, PROJECT_ROLE_MEMBERSHIP_ARGS,
+        ['groups', 'projects', 'roles', 'users']),
+)
+
+
+def dependency_levels(dependencies):
+    """Group the nodes of a dependency graph into levels.
+
+    dependencies maps each node to the nodes it depends on. The nodes of a
+    level only depend on nodes of earlier levels.
+    """
+    levels = []
+    placed = set()
+    while len(placed) < len(dependencies):
+        level = sorted([n for n in dependencies if n not in placed and
+                        set(dependencies[n]) <= placed])
+        if len(level) == 0:
+            raise JiraModuleError("Dependency cycle between: %s" % (
+                ', '.join(sorted(set(dependencies) - placed))))
+        levels.append(level)
+        placed.update(level)
+    return levels
+
+
+class JiraState(JiraModuleBase):
+    """Utility class to converge Jira to a desired-state document"""
+
+    def __init__(self):
+        # The items of every kind are declared, so Ansible hides their
+        # no_log values, such as the passwords of users.
+        self.module_args = dict(
+            resources=dict(
+                required=True,
+                type='dict',
+                options=dict(
+                    (kind, dict(type='list', elements='dict', options=args))
+                    for (kind, (cls, args, dependencies)) in KINDS.items())),
+        )
+
+        self.resources = {}
+        for (kind, (cls, args, dependencies)) in KINDS.items():
+            self.resources[kind] = cls(self, args)
+
+        self.results = dict(
+            jira_state_plan=dict(),
+            jira_state_errors=dict(),
+            jira_state_skipped=[],
+            changed=False,
+        )
+
+        super(JiraState, self).__init__(
+            derived_arg_spec=self.module_args,
+            rest_endpoint=None,
+            supports_check_mode=True,
+        )
+
+    def desired(self):
+        """Validate the document, mapping kinds to their items' params."""
+        desired = {}
+        resources = self.param('resources')
+        for kind in sorted(resources):
+            if kind not in KINDS:
+                raise JiraModuleError(
+                    "Unsupported kind in resources: %s. Supported kinds "
+                    "are: %s" % (kind, ', '.join(sorted(KINDS))))
+
+            # Ansible sets the kinds which are missing to None.
+            items = resources[kind]
+            if items is None:
+                continue
+            if not isinstance(items, list):
+                raise JiraModuleError(
+                    "The items of %s must be a list" % (kind))
+
+            desired[kind] = self.resources[kind].desired(items, kind)
+
+        return desired
+
+    def execute(self, steps):
+        """Carry out (kind, step) tuples of any kinds concurrently."""
+        outcomes = self.parallel(
+            lambda s: self.resources[s[0]].apply(s[1]), steps)
+
+        kinds = set([kind for (kind, step) in steps])
+        for kind in kinds:
+            self.resources[kind].applied(
+                [step for (k, step) in steps if k == kind])
+
+        errors = self.results['jira_state_errors']
+        for ((kind, (name, action, data)), error) in zip(steps, outcomes):
+            if error is not None:
+                kind_errors = errors.setdefault(kind, {})
+                if name in kind_errors:
+                    error = "%s, %s" % (kind_errors[name], error)
+                kind_errors[name] = error
+
+    def exec_module(self, **kwargs):
+        plans = self.results['jira_state_plan']
+        errors = self.results['jira_state_errors']
+        skipped = self.results['jira_state_skipped']
+
+        try:
+            desired = self.desired()
+            levels = dependency_levels(
+                dict((kind, KINDS[kind][2]) for kind in KINDS))
+
+            deletions = []
+            for level in levels:
+                steps = []
+                for kind in [k for k in level if k in desired]:
+                    failed = [k for k in KINDS[kind][2]
+                              if k in errors or k in skipped]
+                    if len(failed) > 0:
+                        skipped.append(kind)
+                        continue
+
+                    try:
+                        plan = self.resources[kind].plan(desired[kind])
+                    except JiraModuleError as e:
+                        errors[kind] = e.message
+                        continue
+
+                    plans[kind] = self.resources[kind].actions(plan)
+                    for step in plan:
+                        if step[1] == 'deleted':
+                            deletions.append((kind, step))
+                        elif step[1] is not None:
+                            steps.append((kind, step))
+
+                if len(steps) > 0:
+                    self.results['changed'] = True
+                    if not self.check_mode:
+                        self.execute(steps)
+
+            # Items are deleted after everything which may refer to them.
+            for level in reversed(levels):
+                steps = [(kind, step) for (kind, step) in deletions
+                         if kind in level]
+                if len(steps) > 0:
+                    self.results['changed'] = True
+                    if not self.check_mode:
+                        self.execute(steps)
+        except Exception as e:
+            self.fail(msg=e.message, **self.results)
+
+        if len(errors) > 0:
+            self.fail(
+                msg="Failed to apply changes to %s kind(s)" % (len(errors)),
+                **self.results)
+
+
+if __name__ == '__main__':
+    JiraState()
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 from ansible.module_utils.jira_common import JiraModuleBase
+from ansible.module_utils.jira_resources import JiraUsers, USER_ARGS
 from ansible.module_utils.six.moves.urllib.parse import urlencode
 
 __metaclass__ = type
@@ -18,16 +19,19 @@ version_added: "0.0.1"
 short_description: manage a user in Jira
 description:
   - Manage a user in Jira
+  - Several users can be managed in one task with C(users).
 
 extends_documentation_fragment:
   - jira_modules_common
+  - jira_modules_write
 
 options:
   username:
-    required: true
+    required: false
     description:
       - The name of the user.
       - Cannot be updated.
+      - Required unless C(users) is set.
 
   key:
     required: false
@@ -69,6 +73,28 @@ options:
       - Can be updated.
     default: ['jira-core']
 
+  state:
+    required: false
+    description:
+      - Whether the user should exist or not.
+      - To deactivate a user, set C(active) to C(false) instead.
+    default: present
+    choices:
+      - absent
+      - present
+
+  users:
+    required: false
+    type: list
+    elements: dict
+    description:
+      - A list of users to manage. Each item is a dict taking the same
+        parameters as this module, except C(users) and C(key).
+      - Parameters missing from an item take their default value.
+      - The users are read concurrently, compared in memory, and only the
+        users which differ are created, updated or deleted, concurrently.
+      - Passwords given in items are hidden from the task output.
+      - Cannot be used with C(username) or C(key).
 
 author: "Joe Topjian <joe@topjian.net>"
 """
@@ -82,6 +108,19 @@ jira_user:
       https://docs.atlassian.com/software/jira/docs/api/REST/8.6.0/#api/2/user-getUser
       for the schema.
   returned: When a Jira user was detected.
+
+jira_user_actions:
+  type: dict
+  description:
+    - Maps the username of every item of C(users) to the action taken.
+  returned: When C(users) is set.
+
+jira_user_errors:
+  type: dict
+  description:
+    - Maps the username of every item of C(users) that could not be
+      changed to the error returned by Jira.
+  returned: When changes to some users in C(users) failed.
 """
 
 EXAMPLES = """
@@ -93,6 +132,17 @@ EXAMPLES = """
     display_name: 'Admin User'
     application_keys:
       - 'jira-core'
+
+- name: Onboard and offboard users
+  jira_user:
+    users:
+      - username: jdoe
+        email_address: jdoe@example.com
+        display_name: John Doe
+      - username: jsmith
+        email_address: jsmith@example.com
+        display_name: Jane Smith
+        active: false
 """
 
 REST_ENDPOINT = "rest/api/2/user"
@@ -103,44 +153,17 @@ class JiraUser(JiraModuleBase):
 
     def __init__(self):
         self.module_args = dict(
-            username=dict(
-                required=True,
-                _jira_field='name',
-                _jira_update=False),
-
-            key=dict(_jira_field='key', _jira_update=False),
-
-            password=dict(
-                no_log=True,
-                _jira_field='password',
-                _jira_update=False),
-
-            email_address=dict(
-                _jira_field='emailAddress',
-                _jira_update=True),
-
-            display_name=dict(
-                _jira_field='displayName',
-                _jira_update=True),
-
-            active=dict(
-                type='bool',
-                default=True,
-                _jira_field='active',
-                _jira_update=True),
-
-            application_keys=dict(
+            USER_ARGS,
+            # The items are declared, so Ansible hides their passwords.
+            users=dict(
                 type='list',
-                default=['jira-core'],
-                _jira_field='applicationKeys',
-                _jira_update=True),
-
-            state=dict(
-                required=False,
-                default='present',
-                choices=['absent', 'present']),
+                elements='dict',
+                options=USER_ARGS,
+                required=False),
         )
 
+        self.resource = JiraUsers(self, USER_ARGS)
+
         self.results = dict(
             jira_user=dict(),
             changed=False,
@@ -148,10 +171,18 @@ class JiraUser(JiraModuleBase):
 
         super(JiraUser, self).__init__(
             derived_arg_spec=self.module_args,
+            write_module=True,
             rest_endpoint=REST_ENDPOINT,
+            mutually_exclusive=[['users', 'username'], ['users', 'key']],
+            required_one_of=[['users', 'username']],
         )
 
     def exec_module(self, **kwargs):
+        if self.param('users') is not None:
+            self.exec_resource(
+                self.resource, self.param('users'), 'users', 'jira_user')
+            return
+
         action = None
         is_install_mode = self.param('state') == 'present'
 
@@ -181,19 +212,8 @@ class JiraUser(JiraModuleBase):
                 if user is False:
                     action = 'created'
                 else:
-                    # Detect updates
-                    for (v, jira_field) in self.jira_update_fields():
-                        if v == 'application_keys':
-                            _application_keys = []
-                            if 'items' in user['applicationRoles']:
-                                for item in user['applicationRoles']['items']:
-                                    _application_keys.append(item['key'])
-
-                            if set(self.param(v)) != set(_application_keys):
-                                update_dict[jira_field] = self.param(v)
-                        else:
-                            if self.param(v) != user[jira_field]:
-                                update_dict[jira_field] = self.param(v)
+                    update_dict = self.resource.detect_updates(
+                        self.module.params, user)
 
                     if len(update_dict) > 0:
                         action = 'updated'
@@ -212,22 +232,16 @@ class JiraUser(JiraModuleBase):
                 return
 
             if action == 'created':
-                data = {}
-                for (v, jira_field) in self.jira_fields():
-                    if jira_field == "active":
-                        continue
-                    if self.param(v):
-                        data[jira_field] = self.param(v)
-
-                self.post(data)
-                user = self.get(query)
+                user = self.post(self.resource.create_data(self.module.params))
+                user = self.write_result(
+                    user, lambda: self.get(query), 'name')
                 self.results['jira_user'] = user
                 return
 
             if action == 'updated':
-                self.put(update_dict, query=query)
-
-                user = self.get(query)
+                user = self.put(update_dict, query=query)
+                user = self.write_result(
+                    user, lambda: self.get(query), 'name')
                 self.results['jira_user'] = user
                 return
 
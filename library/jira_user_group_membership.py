@@ -1,7 +1,9 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
-from ansible.module_utils.jira_common import JiraModuleBase
+from ansible.module_utils.jira_common import JiraModuleBase, JiraModuleError
+from ansible.module_utils.jira_resources import JiraGroupMemberships
+from ansible.module_utils.jira_resources import GROUP_MEMBERSHIP_ARGS
 from ansible.module_utils.six.moves.urllib.parse import urlencode
 
 __metaclass__ = type
@@ -18,16 +20,19 @@ version_added: "0.0.1"
 short_description: manage a group in Jira
 description:
   - Manage a group in Jira
+  - The members of the group are read through all pages, once per task.
+  - Several users can be managed in one task with C(users).
 
 extends_documentation_fragment:
   - jira_modules_common
 
 options:
   username:
-    required: true
+    required: false
     description:
       - The name of the user.
       - Cannot be updated.
+      - Required unless C(users) is set.
 
   group_name:
     required: true
@@ -35,11 +40,54 @@ options:
       - The name of the group.
       - Cannot be updated.
 
+  users:
+    required: false
+    type: list
+    description:
+      - The names of users to be members of the group, or not to be
+        members with C(state=absent).
+      - Only the users which need to be added or removed are, concurrently.
+      - Cannot be used with C(username).
+
+  exclusive:
+    required: false
+    type: bool
+    description:
+      - Remove the members of the group which are not in C(users).
+      - Requires C(users) and C(state=present).
+    default: false
+
+  state:
+    required: false
+    description:
+      - Whether the users should be members of the group or not.
+    default: present
+    choices:
+      - absent
+      - present
+
 author: "Joe Topjian <joe@topjian.net>"
 """
 
 RETURN = """
-Does not return anything.
+jira_user_group_membership_added:
+  type: list
+  description:
+    - The users added to the group.
+  returned: When C(users) is set.
+
+jira_user_group_membership_removed:
+  type: list
+  description:
+    - The users removed from the group.
+  returned: When C(users) is set.
+
+jira_user_group_membership_errors:
+  type: dict
+  description:
+    - Maps the name of every user that could not be added or removed to
+      the error returned by Jira.
+  returned: When changes to some users in C(users) failed.
 """
 
 EXAMPLES = """
@@ -47,6 +95,14 @@ EXAMPLES = """
   jira_user_group_membership:
     username: user_1
     group_name: group_1
+
+- name: Ensure the group has exactly these members
+  jira_user_group_membership:
+    group_name: group_1
+    users:
+      - user_1
+      - user_2
+    exclusive: true
 """
 
 REST_ENDPOINT_CREATE = "rest/api/2/group/user"
@@ -60,14 +116,18 @@ class JiraUserGroupMembership(JiraModuleBase):
 
     def __init__(self):
         self.module_args = dict(
-            username=dict(required=True),
+            username=dict(required=False),
             group_name=dict(required=True),
+            users=dict(required=False, type='list'),
+            exclusive=dict(required=False, type='bool', default=False),
             state=dict(
                 required=False,
                 default='present',
                 choices=['absent', 'present']),
         )
 
+        self.resource = JiraGroupMemberships(self, GROUP_MEMBERSHIP_ARGS)
+
         self.results = dict(
             jira_user_group_membership=dict(),
             changed=False,
@@ -76,9 +136,29 @@ class JiraUserGroupMembership(JiraModuleBase):
         super(JiraUserGroupMembership, self).__init__(
             derived_arg_spec=self.module_args,
             rest_endpoint=REST_ENDPOINT_GET,
+            mutually_exclusive=[['users', 'username']],
+            required_one_of=[['users', 'username']],
         )
 
+    def add(self, username):
+        try:
+            self.add_group_member(self.param('group_name'), username)
+        except JiraModuleError as e:
+            return e.message
+        return None
+
+    def remove(self, username):
+        try:
+            self.remove_group_member(self.param('group_name'), username)
+        except JiraModuleError as e:
+            return e.message
+        return None
+
     def exec_module(self, **kwargs):
+        if self.param('users') is not None:
+            self.exec_bulk(self.param('users'))
+            return
+
         action = None
         is_install_mode = self.param('state') == 'present'
 
@@ -94,22 +174,18 @@ class JiraUserGroupMembership(JiraModuleBase):
         user_query = urlencode(user_query)
 
         try:
-            # NOTE: future issue if more than 50 users in a group.
-            self.rest_endpoint = REST_ENDPOINT_GET
-            group = self.get(group_query)
-            if group is False:
-                self.fail("Jira group %s does not exist" % (group_name))
+            if self.param('exclusive'):
+                raise JiraModuleError("exclusive requires users")
+
+            members = self.group_members(group_name)
 
             self.rest_endpoint = REST_ENDPOINT_USER_GET
             user = self.get(user_query)
             if user is False:
                 self.fail("Jira user %s does not exist" % (username))
 
-            user_exists = False
-            if 'values' in group:
-                for user in group['values']:
-                    if user['name'] == username:
-                        user_exists = True
+            # Jira usernames are case insensitive.
+            user_exists = username.lower() in [m.lower() for m in members]
 
             if not is_install_mode:
                 if user_exists is False:
@@ -147,6 +223,49 @@ class JiraUserGroupMembership(JiraModuleBase):
         except Exception as e:
             self.fail(msg=e.message)
 
+    def exec_bulk(self, users):
+        try:
+            if self.param('exclusive') and self.param('state') != 'present':
+                raise JiraModuleError(
+                    "exclusive cannot be used with state absent")
+
+            members = self.group_members(self.param('group_name'))
+        except Exception as e:
+            self.fail(msg=e.message)
+
+        del(self.results['jira_user_group_membership'])
+
+        (added, removed) = self.resource.diff(
+            users, members, self.param('exclusive'), self.param('state'))
+
+        self.results['jira_user_group_membership_added'] = added
+        self.results['jira_user_group_membership_removed'] = removed
+        if len(added) > 0 or len(removed) > 0:
+            self.results['changed'] = True
+
+        if self.check_mode:
+            return
+
+        changes = [(self.add, u) for u in added] + \
+            [(self.remove, u) for u in removed]
+        outcomes = self.parallel(lambda c: c[0](c[1]), changes)
+
+        errors = {}
+        for ((func, username), error) in zip(changes, outcomes):
+            if error is not None:
+                errors[username] = error
+
+        if len(errors) > 0:
+            self.results['jira_user_group_membership_added'] = [
+                u for u in added if u not in errors]
+            self.results['jira_user_group_membership_removed'] = [
+                u for u in removed if u not in errors]
+            self.fail(
+                msg="Failed to change the membership of %s user(s)" % (
+                    len(errors)),
+                jira_user_group_membership_errors=errors,
+                **self.results)
+
 
 if __name__ == '__main__':
     JiraUserGroupMembership()
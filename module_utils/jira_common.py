@@ -1,12 +1,22 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
+import hashlib
 import json
 import os
+import re
+import stat
+import string
+import tempfile
+import time
+
+from multiprocessing.pool import ThreadPool
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils._text import to_text
+from ansible.module_utils._text import to_bytes, to_text
+from ansible.module_utils.parsing.convert_bool import boolean
 from ansible.module_utils.urls import fetch_url, basic_auth_header
+from ansible.module_utils.six.moves.urllib.parse import urlencode
 
 __metaclass__ = type
 
@@ -17,13 +27,47 @@ JIRA_COMMON_ARGS = dict(
     jira_password=dict(type='str', no_log=True),
     timeout=dict(required=False, type='float', default=10),
     validate_certs=dict(required=False, type='bool', default=True),
+    concurrency=dict(required=False, type='int', default=8),
+    id_cache_ttl=dict(required=False, type='int', default=60),
+)
+
+
+JIRA_LIST_ARGS = dict(
+    index_by=dict(required=False, type='str'),
+)
+
+
+JIRA_WRITE_ARGS = dict(
+    result_refresh=dict(
+        required=False,
+        default='full',
+        choices=['full', 'from_response', 'none']),
 )
 
 
+# Searching users for "." matches every user. Shards replace it with
+# prefixes.
+MATCH_ALL_USERS = "."
+
+# The characters added to truncated user and group searches to split them.
+USER_SHARD_CHARACTERS = string.ascii_lowercase + string.digits
+GROUP_SHARD_CHARACTERS = string.ascii_lowercase + string.digits + '-_ '
+
+# Split searches are not extended by more than this many characters.
+MAX_SHARD_DEPTH = 4
+
+
+class JiraModuleError(Exception):
+    def __init__(self, message, body=None):
+        super(JiraModuleError, self).__init__(message)
+        self.message = message
+        self.body = body
+
+
 class JiraModuleBase(object):
     def __init__(self, derived_arg_spec, rest_endpoint,
-                 facts_module=False, mutually_exclusive=None,
-                 required_one_of=None,
+                 facts_module=False, list_module=False, write_module=False,
+                 mutually_exclusive=None, required_one_of=None,
                  skip_exec=False, supports_check_mode=False):
 
         self.rest_endpoint = rest_endpoint
@@ -31,6 +75,12 @@ class JiraModuleBase(object):
         merged_arg_spec = dict()
         merged_arg_spec.update(JIRA_COMMON_ARGS)
 
+        if list_module:
+            merged_arg_spec.update(JIRA_LIST_ARGS)
+
+        if write_module:
+            merged_arg_spec.update(JIRA_WRITE_ARGS)
+
         if derived_arg_spec:
             merged_arg_spec.update(derived_arg_spec)
 
@@ -42,6 +92,7 @@ class JiraModuleBase(object):
 
         self.check_mode = self.module.check_mode
         self.facts_module = facts_module
+        self.id_maps = {}
 
         if not skip_exec:
             self.exec_module(**self.module.params)
@@ -71,13 +122,24 @@ class JiraModuleBase(object):
         return fields
 
     def get_connection_info(self):
+        try:
+            return self.connection_info()
+        except JiraModuleError as e:
+            self.fail(msg=e.message)
+
+    def connection_info(self):
+        """Return the URL, username and password to connect to Jira with.
+
+        Missing settings are raised as JiraModuleError, as the worker
+        threads of parallel cannot fail the module.
+        """
         url = self.module.params.get('jira_url')
         if not url:
             if os.environ.get('JIRA_URL'):
                 url = os.environ['JIRA_URL']
 
         if not url:
-            self.fail(msg="jira_url not set")
+            raise JiraModuleError("jira_url not set")
 
         username = self.module.params.get('jira_username')
         if not username:
@@ -85,7 +147,7 @@ class JiraModuleBase(object):
                 username = os.environ['JIRA_USERNAME']
 
         if not username:
-            self.fail(msg="jira_username not set")
+            raise JiraModuleError("jira_username not set")
 
         password = self.module.params.get('jira_password')
         if not password:
@@ -93,7 +155,7 @@ class JiraModuleBase(object):
                 password = os.environ['JIRA_PASSWORD']
 
         if not password:
-            self.fail(msg="jira_password not set")
+            raise JiraModuleError("jira_password not set")
 
         return (url, username, password)
 
@@ -116,13 +178,130 @@ class JiraModuleBase(object):
     def param(self, key):
         return self.module.params.get(key)
 
+    def item_params(self, item, list_field, args=None):
+        """Build the parameters of one item of a list mode option.
+
+        Parameters missing from item take the defaults of args, the
+        argument spec of an item, which is the module's own by default.
+        Unknown parameters are rejected and int and bool parameters are
+        converted.
+        """
+        if not isinstance(item, dict):
+            raise JiraModuleError(
+                "Items of %s must be dicts, got %s" % (list_field, item))
+
+        if args is None:
+            args = dict((field, self.module_args[field])
+                        for field in self.module_args if field != list_field)
+
+        params = {}
+        for field in args:
+            params[field] = args[field].get('default')
+
+        for field in item:
+            if field not in params:
+                raise JiraModuleError(
+                    "Unsupported parameter in %s: %s" % (list_field, field))
+            params[field] = item[field]
+
+        for field in params:
+            v = params[field]
+            if v is None:
+                continue
+
+            field_type = args[field].get('type')
+            try:
+                if field_type == 'int':
+                    params[field] = int(v)
+                if field_type == 'bool':
+                    params[field] = boolean(v)
+                if field_type == 'list' and not isinstance(v, list):
+                    raise ValueError(v)
+            except (TypeError, ValueError):
+                raise JiraModuleError(
+                    "%s in %s must be of type %s" % (
+                        field, list_field, field_type))
+
+            choices = args[field].get('choices')
+            if choices is not None and params[field] not in choices:
+                raise JiraModuleError(
+                    "%s in %s must be one of: %s" % (
+                        field, list_field, ', '.join(choices)))
+
+        return params
+
+    def write_result(self, response, refresh, key):
+        """Return the object to report after a create or update.
+
+        response is what the write request returned and refresh re-reads
+        the object. Which one is used depends on result_refresh; with
+        from_response, the response is used when it contains key.
+        """
+        policy = self.param('result_refresh')
+        if policy == 'full':
+            return refresh()
+
+        if policy == 'from_response':
+            if not isinstance(response, dict) or key not in response:
+                return refresh()
+
+        return response
+
+    def exec_resource(self, resource, items, list_field, prefix):
+        """Converge the items of a list mode option.
+
+        resource is the reconciler of the items, a JiraResource. The
+        action taken for each item is returned as <prefix>_actions and
+        the errors of the changes which failed as <prefix>_errors.
+        """
+        try:
+            plan = resource.plan(resource.desired(items, list_field))
+        except Exception as e:
+            self.fail(msg=e.message)
+
+        del(self.results[prefix])
+
+        actions = resource.actions(plan)
+        self.results['%s_actions' % (prefix)] = actions
+        if len([a for a in actions.values() if a is not None]) > 0:
+            self.results['changed'] = True
+
+        if self.check_mode:
+            return
+
+        errors = resource.execute(plan)
+        if len(errors) > 0:
+            self.results['%s_errors' % (prefix)] = errors
+            self.fail(
+                msg="Failed to apply changes to %s item(s) of %s" % (
+                    len(errors), list_field),
+                **self.results)
+
+    def list_fact(self, items):
+        index_by = self.param('index_by')
+        if index_by is None:
+            return items
+        return index_items(items, index_by)
+
     def request(self, query=None, data=None, method='GET'):
+        try:
+            return self.fetch(
+                self.rest_endpoint, query=query, data=data, method=method)
+        except JiraModuleError as e:
+            self.fail(msg=e.message)
+
+    def fetch(self, endpoint, query=None, data=None, method='GET'):
+        """Request an explicit endpoint without touching rest_endpoint.
+
+        Errors are raised as JiraModuleError rather than failing the
+        module, which makes this safe to call from worker threads.
+        """
         if data:
             data = json.dumps(data)
 
-        (url, username, password) = self.get_connection_info()
+        (url, username, password) = self.connection_info()
 
-        url = "%s%s" % (normalize_url(url), self.rest_endpoint)
+        url = "%s%s" % (normalize_url(url), endpoint)
         timeout = self.module.params['timeout']
 
         if query is not None:
@@ -139,13 +318,14 @@ class JiraModuleBase(object):
         if info['status'] == 404:
             return False
 
+        body = {}
+        _body = {}
         if response is not None:
             _body = response.read()
             self.debug(msg="Body result: %s" % (_body))
             if _body:
                 body = json.loads(to_text(_body, errors='surrogate_or_strict'))
-            else:
-                body = {}
+            _body = body
 
         if info['status'] not in (200, 201, 204):
             error_msgs = []
@@ -153,16 +333,19 @@ class JiraModuleBase(object):
             if 'msg' in info:
                 error_msgs.append(info['msg'])
 
-            if 'body' in info:
-                _body = json.loads(
-                    to_text(info['body'],
-                            errors='surrogate_or_strict'))
+            if info.get('body'):
+                try:
+                    _body = json.loads(
+                        to_text(info['body'],
+                                errors='surrogate_or_strict'))
+                except ValueError:
+                    _body = {}
 
             if 'errorMessages' in _body:
                 for e in _body['errorMessages']:
                     error_msgs.append(e)
 
-            if 'errors' in _body:
+            if isinstance(_body.get('errors'), dict):
                 for e in _body['errors']:
                     error_msgs.append("%s: %s" % (e, _body['errors'][e]))
 
@@ -172,10 +355,437 @@ class JiraModuleBase(object):
             else:
                 error_msg = "HTTP Error %s" % (info['status'])
 
-            self.fail(msg=error_msg)
+            raise JiraModuleError(error_msg, body=_body)
 
         return body
 
+    def parallel(self, func, items):
+        """Map func over items using up to `concurrency` worker threads.
+
+        Results are returned in the order of items. The first exception
+        raised by func is re-raised in the calling thread.
+        """
+        items = list(items)
+        if len(items) == 0:
+            return []
+
+        workers = min(max(self.param('concurrency') or 1, 1), len(items))
+        if workers == 1:
+            return [func(item) for item in items]
+
+        pool = ThreadPool(workers)
+        try:
+            return pool.map(func, items)
+        finally:
+            pool.close()
+            pool.join()
+
+    def lookup_all(self, lookup, identifiers):
+        """Run lookup for each identifier in parallel.
+
+        Returns a dict of the results keyed by identifier and a list of
+        the identifiers lookup returned False for.
+        """
+        unique = []
+        for i in identifiers:
+            if i not in unique:
+                unique.append(i)
+
+        found = {}
+        missing = []
+        for (i, v) in zip(unique, self.parallel(lookup, unique)):
+            if v is False:
+                missing.append(i)
+            else:
+                found[i] = v
+
+        return (found, missing)
+
+    def resolve_id(self, endpoint, name, refresh=False):
+        """Resolve the name of an item in a collection to its id.
+
+        The collection's name to id map is built with a single request,
+        kept for the rest of the run and shared with other module runs
+        through a file cache for id_cache_ttl seconds. A name missing
+        from a cached map is always looked up again.
+        """
+        ids = None
+        if not refresh:
+            ids = self.id_maps.get(endpoint)
+            if ids is None:
+                ids = self.read_id_cache(endpoint)
+
+        if ids is None or name not in ids:
+            ids = {}
+            items = self.fetch(endpoint)
+            for item in items or []:
+                ids[item['name']] = item['id']
+            self.write_id_cache(endpoint, ids)
+
+        self.id_maps[endpoint] = ids
+        return ids.get(name)
+
+    def read_named(self, endpoint, name):
+        """Read the item of a collection with the given name.
+
+        The id comes from resolve_id. A cached id may point at an item
+        which was deleted or renamed since, so the item read must have the
+        requested name, otherwise the id is resolved again from a fresh
+        listing. Returns the id and the item, or (None, False).
+        """
+        for refresh in [False, True]:
+            id = self.resolve_id(endpoint, name, refresh)
+            if id is None:
+                return (None, False)
+
+            item = self.fetch("%s/%s" % (endpoint, id))
+            if item is not False and item.get('name') == name:
+                return (id, item)
+
+            self.invalidate_ids(endpoint)
+
+        return (None, False)
+
+    def invalidate_ids(self, endpoint):
+        self.id_maps.pop(endpoint, None)
+        path = self.id_cache_path(endpoint)
+        if path is not None and os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def id_cache_dir(self):
+        """Return the directory of the id cache.
+
+        The directory belongs to the user running the module and only they
+        can access it. Returns None if a directory of that name exists but
+        does not qualify, in which case nothing is cached.
+        """
+        path = os.path.join(
+            tempfile.gettempdir(), "ansible-jira-ids-%s" % (os.getuid()))
+        try:
+            os.mkdir(path, 0o700)
+        except OSError:
+            pass
+
+        try:
+            st = os.lstat(path)
+        except OSError:
+            return None
+
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or \
+                st.st_mode & 0o077:
+            self.debug("Not using Jira id cache %s: it is not private to "
+                       "the current user" % (path))
+            return None
+
+        return path
+
+    def id_cache_path(self, endpoint):
+        if self.param('id_cache_ttl') <= 0:
+            return None
+
+        directory = self.id_cache_dir()
+        if directory is None:
+            return None
+
+        (url, username, password) = self.connection_info()
+        digest = hashlib.sha1(to_bytes("%s|%s|%s" % (
+            normalize_url(url), username, endpoint))).hexdigest()
+        return os.path.join(directory, "%s.json" % (digest))
+
+    def read_id_cache(self, endpoint):
+        path = self.id_cache_path(endpoint)
+        if path is None or not os.path.exists(path):
+            return None
+
+        try:
+            st = os.lstat(path)
+            if not stat.S_ISREG(st.st_mode) or st.st_uid != os.getuid() or \
+                    st.st_mode & 0o022:
+                return None
+            if time.time() - st.st_mtime > self.param('id_cache_ttl'):
+                return None
+            with open(path) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def write_id_cache(self, endpoint, ids):
+        path = self.id_cache_path(endpoint)
+        if path is None:
+            return
+
+        try:
+            write_json(path, ids)
+        except (IOError, OSError):
+            self.debug("Unable to write Jira id cache %s" % (path))
+
+    def fetch_all_pages(self, endpoint, query, page_size=None, key='values'):
+        """Fetch every page of a resource paginated with startAt.
+
+        The first page is returned with its `key` list extended by the
+        remaining pages. Once the total is known the remaining pages are
+        fetched in parallel, otherwise isLast is followed page by page.
+        """
+        query = dict(query)
+        query['startAt'] = 0
+        if page_size is not None:
+            query['maxResults'] = page_size
+
+        first = self.fetch(endpoint, urlencode(query))
+        if first is False:
+            return False
+
+        values = list(first.get(key, []))
+        # Jira may lower maxResults, so step by what it actually used.
+        step = first.get('maxResults') or len(values)
+
+        if first.get('isLast', True) or step == 0:
+            pass
+        elif 'total' in first:
+            def fetch_page(start_at):
+                page_query = dict(query, startAt=start_at, maxResults=step)
+                page = self.fetch(endpoint, urlencode(page_query))
+                if page is False:
+                    return []
+                return page.get(key, [])
+
+            starts = range(len(values), first['total'], step)
+            for page in self.parallel(fetch_page, starts):
+                values.extend(page)
+        else:
+            page = first
+            while not page.get('isLast', True):
+                query['startAt'] = len(values)
+                page = self.fetch(endpoint, urlencode(query))
+                if page is False or len(page.get(key, [])) == 0:
+                    break
+                values.extend(page[key])
+
+        first[key] = values
+        first['startAt'] = 0
+        first['isLast'] = True
+        first.pop('nextPage', None)
+        return first
+
+    def search_issues(self, jql, fields, page_size=100, validate=True):
+        """Run a JQL search, yielding the matching issues page by page.
+
+        The search is POSTed so the JQL is not bounded by URL limits. With
+        validate=False, references to issues which do not exist do not
+        fail the search.
+        """
+        data = {
+            'jql': jql,
+            'fields': fields,
+            'maxResults': page_size,
+            'startAt': 0,
+        }
+        if not validate:
+            data['validateQuery'] = False
+
+        while True:
+            page = self.fetch("rest/api/2/search", data=data, method='POST')
+            if page is False:
+                return
+
+            issues = page.get('issues', [])
+            for issue in issues:
+                yield issue
+
+            data['startAt'] += len(issues)
+            if len(issues) == 0 or data['startAt'] >= page.get('total', 0):
+                return
+
+    def group_members(self, group_name):
+        """Return the names of all members of a group, over all pages."""
+        query = {
+            'groupname': group_name,
+            'includeInactiveUsers': 'true',
+        }
+        group = self.fetch_all_pages("rest/api/2/group/member", query)
+        if group is False:
+            raise JiraModuleError(
+                "Jira group %s does not exist" % (group_name))
+
+        return set([user['name'] for user in group.get('values', [])])
+
+    def add_group_member(self, group_name, username):
+        query = urlencode({'groupname': group_name})
+        self.fetch("rest/api/2/group/user", query, data={'name': username},
+                   method='POST')
+
+    def remove_group_member(self, group_name, username):
+        query = urlencode({'groupname': group_name, 'username': username})
+        self.fetch("rest/api/2/group/user", query, method='DELETE')
+
+    def count_issues(self, jql):
+        """Count the issues matching a JQL query without reading them."""
+        data = {
+            'jql': jql,
+            'fields': ['key'],
+            'maxResults': 0,
+        }
+        page = self.fetch("rest/api/2/search", data=data, method='POST')
+        if page is False:
+            return 0
+        return page.get('total', 0)
+
+    def iter_issue_pages(self, jql, fields, page_size=100, after_id=None):
+        """Yield the issues matching a JQL query, one page at a time.
+
+        Pages are read in issue id order, each page starting after the
+        last id of the previous one rather than at an offset, so issues
+        leaving or entering the results while the pages are processed
+        do not shift the following pages. after_id resumes after an
+        already processed issue.
+        """
+        if re.search(r'\border\s+by\b', jql, re.I):
+            raise JiraModuleError("The JQL query cannot have an ORDER BY")
+
+        while True:
+            q = "(%s)" % (jql)
+            if after_id is not None:
+                q += " AND id > %s" % (after_id)
+            q += " ORDER BY id ASC"
+
+            data = {
+                'jql': q,
+                'fields': fields,
+                'maxResults': page_size,
+            }
+            page = self.fetch("rest/api/2/search", data=data, method='POST')
+            if page is False:
+                return
+
+            issues = page.get('issues', [])
+            if len(issues) == 0:
+                return
+
+            yield issues
+            after_id = issues[-1]['id']
+
+    def sharded_search(self, search, query, shards, key):
+        """Run a search that may be truncated by the server.
+
+        search(query) returns a tuple of (items, truncated). Truncated
+        queries are split into the queries returned by shards(query),
+        level by level, with each level run in parallel. Items are
+        deduplicated by key and returned as a dict.
+        """
+        found = {}
+        seen = set([query])
+        pending = [query]
+        while len(pending) > 0:
+            next_pending = []
+            results = self.parallel(search, pending)
+            for (q, (items, truncated)) in zip(pending, results):
+                for item in items:
+                    found[item[key]] = item
+
+                if not truncated:
+                    continue
+
+                children = [c for c in shards(q) if c not in seen]
+                if len(children) == 0:
+                    self.module.warn(
+                        "Search for '%s' was truncated by Jira" % (q))
+                seen.update(children)
+                next_pending.extend(children)
+
+            pending = next_pending
+
+        return found
+
+    def enumerate_users(self, username=MATCH_ALL_USERS, include_active=True,
+                        include_inactive=False, page_size=1000,
+                        search_limit=1000,
+                        shard_characters=USER_SHARD_CHARACTERS):
+        """Return every user matching username, sorted by name.
+
+        The user search stops at search_limit results, however it is
+        paged. Searches reaching it are split into prefix searches.
+        """
+        def search(prefix):
+            query = {
+                'username': prefix,
+                'includeActive': include_active,
+                'includeInactive': include_inactive,
+            }
+
+            users = []
+            while True:
+                query['startAt'] = len(users)
+                query['maxResults'] = min(page_size, search_limit - len(users))
+
+                page = self.fetch("rest/api/2/user/search", urlencode(query))
+                if not page:
+                    return (users, False)
+
+                users.extend(page)
+                if len(users) >= search_limit:
+                    return (users, True)
+
+                if len(page) < query['maxResults']:
+                    return (users, False)
+
+        def shards(prefix):
+            base = username
+            if base == MATCH_ALL_USERS:
+                base = ''
+            if prefix == MATCH_ALL_USERS:
+                prefix = ''
+
+            if len(prefix) - len(base) >= MAX_SHARD_DEPTH:
+                return []
+
+            return [prefix + c for c in shard_characters]
+
+        users = self.sharded_search(search, username, shards, 'key')
+        return sorted(users.values(), key=lambda u: u['name'])
+
+    def enumerate_groups(self, group_query='', exclude=None, username=None,
+                         page_size=1000,
+                         shard_characters=GROUP_SHARD_CHARACTERS):
+        """Return every group matching group_query, sorted by name.
+
+        The group picker has no offset, so searches matching more than
+        page_size groups are split into narrower searches.
+        """
+        def search(q):
+            query = {'maxResults': page_size}
+            if exclude:
+                query['exclude'] = exclude
+            if username:
+                query['username'] = username
+            if q:
+                query['query'] = q
+
+            v = self.fetch("rest/api/2/groups/picker", urlencode(query))
+            if v is False:
+                return ([], False)
+
+            groups = v['groups']
+            return (groups, len(groups) < v.get('total', len(groups)))
+
+        def shards(q):
+            if len(q) - len(group_query) >= MAX_SHARD_DEPTH:
+                return []
+
+            # The picker matches anywhere in the group name, so extend the
+            # search on both sides.
+            shards = []
+            for c in shard_characters:
+                shards.append(q + c)
+                if q:
+                    shards.append(c + q)
+            return shards
+
+        groups = self.sharded_search(search, group_query, shards, 'name')
+        return sorted(groups.values(), key=lambda g: g['name'])
+
     def post(self, data, query=None):
         return self.request(
             query=query, data=data, method='POST')
@@ -191,6 +801,48 @@ class JiraModuleBase(object):
         return self.request(query=query, method='DELETE')
 
 
+def index_items(items, attribute):
+    index = {}
+    path = attribute.split('.')
+    for item in items:
+        value = item
+        for p in path:
+            if not isinstance(value, dict) or p not in value:
+                raise JiraModuleError(
+                    "Unable to index by %s: not every item has it" % (
+                        attribute))
+            value = value[p]
+
+        try:
+            hash(value)
+        except TypeError:
+            raise JiraModuleError(
+                "Unable to index by %s: its values are not scalars" % (
+                    attribute))
+
+        if value in index:
+            raise JiraModuleError(
+                "Unable to index by %s: %s is not unique" % (
+                    attribute, value))
+        index[value] = item
+
+    return index
+
+
+def write_json(path, data):
+    """Atomically replace the file at path with data as JSON."""
+    (fd, tmp) = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    with os.fdopen(fd, 'w') as f:
+        json.dump(data, f)
+    os.rename(tmp, path)
+
+
+def jql_quote(value):
+    """Quote a value for use in a JQL query."""
+    value = value.replace('\\', '\\\\').replace('"', '\\"')
+    return '"%s"' % (value)
+
+
 def normalize_url(url):
     if not url.endswith('/'):
         url = url + '/'
@@ -0,0 +1,915 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# The reconcilers of the list modes of the write modules. They live here
+# rather than in the modules so that jira_state can drive them too, as
+# modules cannot import each other.
+
+from ansible.module_utils.jira_common import JiraModuleError
+from ansible.module_utils.six.moves.urllib.parse import urlencode
+
+__metaclass__ = type
+
+
+STATE_ARG = dict(
+    required=False,
+    default='present',
+    choices=['absent', 'present'])
+
+
+GROUP_ARGS = dict(
+    name=dict(required=False),
+    state=STATE_ARG,
+)
+
+
+USER_ARGS = dict(
+    username=dict(
+        required=False,
+        _jira_field='name',
+        _jira_update=False),
+
+    key=dict(_jira_field='key', _jira_update=False),
+
+    password=dict(
+        no_log=True,
+        _jira_field='password',
+        _jira_update=False),
+
+    email_address=dict(
+        _jira_field='emailAddress',
+        _jira_update=True),
+
+    display_name=dict(
+        _jira_field='displayName',
+        _jira_update=True),
+
+    active=dict(
+        type='bool',
+        default=True,
+        _jira_field='active',
+        _jira_update=True),
+
+    application_keys=dict(
+        type='list',
+        default=['jira-core'],
+        _jira_field='applicationKeys',
+        _jira_update=True),
+
+    state=STATE_ARG,
+)
+
+
+ROLE_ARGS = dict(
+    name=dict(
+        required=False,
+        _jira_field='name',
+        _jira_update=False),
+
+    description=dict(
+        required=False,
+        _jira_field='description',
+        _jira_update=True),
+
+    state=STATE_ARG,
+)
+
+
+PROJECT_CATEGORY_ARGS = dict(
+    name=dict(
+        required=False,
+        _jira_field='name',
+        _jira_update=False),
+
+    description=dict(
+        required=False,
+        _jira_field='description',
+        _jira_update=True),
+
+    state=STATE_ARG,
+)
+
+
+PROJECT_ARGS = dict(
+    name=dict(
+        _jira_field='name',
+        _jira_update=False),
+
+    key=dict(
+        _jira_field='key',
+        _jira_update=False),
+
+    project_type_key=dict(
+        _jira_field='projectTypeKey',
+        _jira_update=False),
+
+    project_template_key=dict(
+        _jira_field='projectTemplateKey',
+        _jira_update=False),
+
+    description=dict(
+        _jira_field='description',
+        _jira_update=True),
+
+    lead=dict(
+        _jira_field='lead',
+        _jira_update=True),
+
+    url=dict(
+        _jira_field='url',
+        _jira_update=True),
+
+    avatar_id=dict(
+        type='int',
+        _jira_field='avatarId',
+        _jira_update=True),
+
+    issue_security_scheme=dict(
+        type='int',
+        _jira_field='issueSecurityScheme',
+        _jira_update=True),
+
+    permission_scheme=dict(
+        type='int',
+        _jira_field='permissionScheme',
+        _jira_update=True),
+
+    notification_scheme=dict(
+        type='int',
+        _jira_field='notificationScheme',
+        _jira_update=True),
+
+    workflow_scheme_id=dict(
+        type='int',
+        _jira_field='workflowSchemeId',
+        _jira_update=False),
+
+    category_id=dict(
+        _jira_field='categoryId',
+        _jira_update=True),
+
+    category_name=dict(required=False),
+
+    state=STATE_ARG,
+)
+
+
+GROUP_MEMBERSHIP_ARGS = dict(
+    group_name=dict(required=False),
+    users=dict(required=False, type='list'),
+    exclusive=dict(required=False, type='bool', default=False),
+    state=STATE_ARG,
+)
+
+
+PROJECT_ROLE_MEMBERSHIP_ARGS = dict(
+    project_key=dict(required=False),
+    role_name=dict(required=False),
+    users=dict(required=False, type='list'),
+    groups=dict(required=False, type='list'),
+    state=STATE_ARG,
+)
+
+
+GROUP_ENDPOINT = "rest/api/2/group"
+GROUP_MEMBER_ENDPOINT = "rest/api/2/group/member"
+GROUP_PICKER_ENDPOINT = "rest/api/2/groups/picker"
+USER_ENDPOINT = "rest/api/2/user"
+ROLE_ENDPOINT = "rest/api/2/role"
+PROJECT_CATEGORY_ENDPOINT = "rest/api/2/projectCategory"
+PROJECT_ENDPOINT = "rest/api/2/project"
+PROJECT_ROLE_ENDPOINT = "rest/api/2/project/%s/role/%s"
+
+# The number of groups requested from the group picker at once.
+GROUP_LIST_LIMIT = 1000
+
+# Maps scheme parameters to the project resource holding the scheme in use.
+SCHEME_RESOURCES = dict(
+    issue_security_scheme='issuesecuritylevelscheme',
+    notification_scheme='notificationscheme',
+    permission_scheme='permissionscheme',
+    workflow_scheme_id='workflowscheme',
+)
+
+PROJECT_EXPAND = ','.join(['description', 'lead', 'url', 'projectKeys'])
+
+ACTOR_TYPES = {
+    'group': 'atlassian-group-role-actor',
+    'user': 'atlassian-user-role-actor',
+}
+
+
+class JiraResource(object):
+    """Reconcile a list of Jira resources of one kind.
+
+    module is the JiraModuleBase sending the requests and args the
+    argument spec of one item. plan reads the current state of the items
+    in bulk and diffs them into (name, action, data) steps, which are then
+    carried out concurrently by execute.
+    """
+
+    # The parameters identifying an item and the noun used in messages.
+    required = ['name']
+    noun = 'Resource'
+
+    def __init__(self, module, args):
+        self.module = module
+        self.args = args
+
+    def jira_fields(self):
+        return [[field, self.args[field]['_jira_field']]
+                for field in self.args if '_jira_field' in self.args[field]]
+
+    def jira_update_fields(self):
+        return [[field, self.args[field]['_jira_field']]
+                for field in self.args
+                if self.args[field].get('_jira_update')]
+
+    def name(self, params):
+        return params[self.required[0]]
+
+    def validate(self, params):
+        pass
+
+    def desired(self, items, list_field):
+        """Build and validate the parameters of the items of list_field."""
+        desired = []
+        names = set()
+        for item in items:
+            params = self.module.item_params(item, list_field, self.args)
+
+            missing = [f for f in self.required if params[f] is None]
+            if len(missing) > 0:
+                raise JiraModuleError("Items of %s require %s" % (
+                    list_field, ', '.join(missing)))
+
+            self.validate(params)
+
+            name = self.name(params)
+            if name in names:
+                raise JiraModuleError(
+                    "%s %s is listed more than once" % (self.noun, name))
+            names.add(name)
+            desired.append(params)
+
+        return desired
+
+    def plan(self, desired):
+        raise JiraModuleError(
+            "Error: {0} failed to implement plan method.".format(
+                self.__class__.__name__))
+
+    def write(self, step):
+        # Steps are written from worker threads, which cannot fail the
+        # module, so the error is reported as the step's.
+        raise JiraModuleError(
+            "Error: {0} failed to implement write method.".format(
+                self.__class__.__name__))
+
+    def apply(self, step):
+        """Carry out one step, returning the error it failed with."""
+        try:
+            self.write(step)
+        except JiraModuleError as e:
+            return e.message
+        return None
+
+    def applied(self, steps):
+        """Called once the given steps were carried out."""
+        pass
+
+    def actions(self, plan):
+        """Map the name of every planned item to its action."""
+        actions = {}
+        for (name, action, data) in plan:
+            if actions.get(name) is None:
+                actions[name] = action
+        return actions
+
+    def execute(self, steps):
+        """Carry out steps concurrently, mapping names to their errors."""
+        changes = [step for step in steps if step[1] is not None]
+        outcomes = self.module.parallel(self.apply, changes)
+        self.applied(changes)
+
+        errors = {}
+        for ((name, action, data), error) in zip(changes, outcomes):
+            if error is not None:
+                errors.setdefault(name, []).append(error)
+
+        return dict((name, ', '.join(e)) for (name, e) in errors.items())
+
+
+class JiraGroups(JiraResource):
+    """Reconcile Jira groups, which can only be created or deleted"""
+
+    noun = 'Group'
+
+    def existing_groups(self, names):
+        """Return which of the given group names exist.
+
+        Jira group names are case insensitive, so the lower-case name of
+        each existing group is mapped to the name Jira holds it with.
+        """
+        query = urlencode({'query': '', 'maxResults': GROUP_LIST_LIMIT})
+        v = self.module.fetch(GROUP_PICKER_ENDPOINT, query) or {}
+        listed = v.get('groups', [])
+
+        wanted = set([name.lower() for name in names])
+        existing = dict((g['name'].lower(), g['name']) for g in listed
+                        if g['name'].lower() in wanted)
+        if len(listed) >= v.get('total', len(listed)):
+            return existing
+
+        # The listing was truncated, look up the groups it missed.
+        def exists(name):
+            query = urlencode({'groupname': name, 'maxResults': 1})
+            return self.module.fetch(GROUP_MEMBER_ENDPOINT, query) is not False
+
+        missed = sorted(set([n for n in names if n.lower() not in existing]))
+        for (name, found) in zip(missed, self.module.parallel(exists, missed)):
+            if found:
+                existing[name.lower()] = name
+
+        return existing
+
+    def plan(self, desired):
+        existing = self.existing_groups([p['name'] for p in desired])
+
+        plan = []
+        for params in desired:
+            name = existing.get(params['name'].lower())
+            action = None
+            if params['state'] == 'absent' and name is not None:
+                action = 'deleted'
+            if params['state'] == 'present' and name is None:
+                action = 'created'
+            plan.append((name or params['name'], action, None))
+
+        return plan
+
+    def write(self, step):
+        (name, action, data) = step
+        if action == 'created':
+            self.module.fetch(GROUP_ENDPOINT, data={'name': name},
+                              method='POST')
+        if action == 'deleted':
+            self.module.fetch(GROUP_ENDPOINT, urlencode({'groupname': name}),
+                              method='DELETE')
+
+
+class JiraUsers(JiraResource):
+    """Reconcile Jira users"""
+
+    required = ['username']
+    noun = 'User'
+
+    def validate(self, params):
+        if params['key'] is not None:
+            raise JiraModuleError("Items of users cannot set key")
+
+    def detect_updates(self, params, user):
+        update_dict = {}
+        for (v, jira_field) in self.jira_update_fields():
+            if v == 'application_keys':
+                _application_keys = []
+                if 'items' in user['applicationRoles']:
+                    for item in user['applicationRoles']['items']:
+                        _application_keys.append(item['key'])
+
+                if set(params[v]) != set(_application_keys):
+                    update_dict[jira_field] = params[v]
+            else:
+                if params[v] != user[jira_field]:
+                    update_dict[jira_field] = params[v]
+
+        return update_dict
+
+    def create_data(self, params):
+        data = {}
+        for (v, jira_field) in self.jira_fields():
+            if jira_field == "active":
+                continue
+            if params[v]:
+                data[jira_field] = params[v]
+        return data
+
+    def read_user(self, username):
+        query = urlencode({'username': username, 'expand': 'applicationRoles'})
+        return self.module.fetch(USER_ENDPOINT, query)
+
+    def plan(self, desired):
+        users = self.module.parallel(
+            self.read_user, [params['username'] for params in desired])
+
+        plan = []
+        for (params, user) in zip(desired, users):
+            name = params['username']
+            if params['state'] == 'absent':
+                if user is False:
+                    plan.append((name, None, None))
+                else:
+                    plan.append((name, 'deleted', None))
+            elif user is False:
+                plan.append((name, 'created', self.create_data(params)))
+            else:
+                update_dict = self.detect_updates(params, user)
+                if len(update_dict) > 0:
+                    plan.append((name, 'updated', update_dict))
+                else:
+                    plan.append((name, None, None))
+
+        return plan
+
+    def write(self, step):
+        (name, action, data) = step
+        query = urlencode({'username': name})
+        if action == 'created':
+            self.module.fetch(USER_ENDPOINT, data=data, method='POST')
+        if action == 'updated':
+            self.module.fetch(USER_ENDPOINT, query, data=data, method='PUT')
+        if action == 'deleted':
+            self.module.fetch(USER_ENDPOINT, query, method='DELETE')
+
+
+class JiraNamedResource(JiraResource):
+    """Reconcile the items of a collection listed in a single request.
+
+    Items are addressed by id, which is resolved through the shared id
+    cache of the collection.
+    """
+
+    endpoint = None
+    update_method = 'PUT'
+
+    def detect_updates(self, params, item):
+        update_dict = {}
+        for (v, jira_field) in self.jira_update_fields():
+            if jira_field in item:
+                if params[v] != item[jira_field]:
+                    update_dict[jira_field] = params[v]
+        return update_dict
+
+    def create_data(self, params):
+        data = {}
+        for (v, jira_field) in self.jira_fields():
+            if params[v]:
+                data[jira_field] = params[v]
+        return data
+
+    def plan(self, desired):
+        existing = {}
+        for item in self.module.fetch(self.endpoint) or []:
+            existing[item['name']] = item
+
+        plan = []
+        for params in desired:
+            name = params['name']
+            item = existing.get(name)
+            if params['state'] == 'absent':
+                if item is None:
+                    plan.append((name, None, None))
+                else:
+                    plan.append((name, 'deleted', (item['id'], None)))
+            elif item is None:
+                plan.append(
+                    (name, 'created', (None, self.create_data(params))))
+            else:
+                update_dict = self.detect_updates(params, item)
+                if len(update_dict) > 0:
+                    plan.append(
+                        (name, 'updated', (item['id'], update_dict)))
+                else:
+                    plan.append((name, None, None))
+
+        return plan
+
+    def write(self, step):
+        (name, action, (id, data)) = step
+        endpoint = "%s/%s" % (self.endpoint, id)
+        if action == 'created':
+            self.module.fetch(self.endpoint, data=data, method='POST')
+        if action == 'updated':
+            self.module.fetch(endpoint, data=data, method=self.update_method)
+        if action == 'deleted':
+            self.module.fetch(endpoint, method='DELETE')
+
+    def applied(self, steps):
+        if len([s for s in steps if s[1] in ['created', 'deleted']]) > 0:
+            self.module.invalidate_ids(self.endpoint)
+
+
+class JiraRoles(JiraNamedResource):
+    """Reconcile Jira roles"""
+
+    noun = 'Role'
+    endpoint = ROLE_ENDPOINT
+    update_method = 'POST'
+
+
+class JiraProjectCategories(JiraNamedResource):
+    """Reconcile Jira project categories"""
+
+    noun = 'Project category'
+    endpoint = PROJECT_CATEGORY_ENDPOINT
+
+
+class JiraProjects(JiraResource):
+    """Reconcile Jira projects"""
+
+    required = ['key']
+    noun = 'Project'
+
+    def validate(self, params):
+        required = ['key']
+        if params['state'] == 'present':
+            required = ['name', 'key', 'lead']
+
+        missing = [f for f in required if params[f] is None]
+        if len(missing) > 0:
+            raise JiraModuleError(
+                "missing required arguments: %s" % (', '.join(missing)))
+
+        if params['category_id'] is not None and \
+                params['category_name'] is not None:
+            raise JiraModuleError(
+                "parameters are mutually exclusive: "
+                "category_id|category_name")
+
+        if params['state'] == 'present':
+            types = [params['project_type_key'],
+                     params['project_template_key']]
+            if types.count(None) == 2:
+                raise JiraModuleError(
+                    "one of the following is required: "
+                    "project_type_key, project_template_key")
+            if types.count(None) == 0:
+                raise JiraModuleError(
+                    "parameters are mutually exclusive: "
+                    "project_type_key|project_template_key")
+
+    def resolve_category(self, params, ids=None):
+        """Set category_id from category_name.
+
+        ids maps the category names already resolved to their ids, so
+        items sharing a category resolve it once.
+
+        In check mode, a category which does not exist yet may be created
+        by the same run, so it is left unmanaged instead of failing.
+        """
+        name = params['category_name']
+        if name is None or params['state'] != 'present':
+            return
+
+        if ids is None:
+            ids = {}
+        if name not in ids:
+            (ids[name], category) = self.module.read_named(
+                PROJECT_CATEGORY_ENDPOINT, name)
+
+        id = ids[name]
+        if id is None and not self.module.check_mode:
+            raise JiraModuleError(
+                "Unable to find Jira project category %s" % (name))
+        if id is not None:
+            params['category_id'] = str(id)
+
+    def scheme_fields(self, params):
+        fields = []
+        for (v, jira_field) in self.jira_update_fields():
+            if v in SCHEME_RESOURCES and params[v] is not None:
+                fields.append(v)
+        return fields
+
+    def get_scheme_id(self, key, field):
+        endpoint = "%s/%s/%s" % (
+            PROJECT_ENDPOINT, key, SCHEME_RESOURCES[field])
+        scheme = self.module.fetch(endpoint)
+        if scheme is False:
+            return None
+        return scheme['id']
+
+    def get_scheme_ids(self, params):
+        # Read the schemes the project uses concurrently, but only for the
+        # scheme parameters that were set.
+        fields = self.scheme_fields(params)
+        ids = self.module.parallel(
+            lambda f: self.get_scheme_id(params['key'], f), fields)
+        return dict(zip(fields, ids))
+
+    def detect_updates(self, params, project, scheme_ids):
+        update_dict = {}
+
+        for (v, jira_field) in self.jira_update_fields():
+            if v in scheme_ids:
+                if params[v] != scheme_ids[v]:
+                    update_dict[jira_field] = params[v]
+                continue
+
+            if jira_field == "categoryId":
+                # The project holds its category as an object.
+                category = project.get('projectCategory') or {}
+                if params[v] is not None and \
+                        str(params[v]) != category.get('id'):
+                    update_dict[jira_field] = params[v]
+                continue
+
+            if jira_field in project:
+                if jira_field == "lead":
+                    lead = params[v]
+                    _lead = project[jira_field]['name']
+                    if lead != _lead:
+                        update_dict[jira_field] = lead
+                        update_dict['assigneeType'] = 'PROJECT_LEAD'
+                    continue
+
+                if jira_field == "description":
+                    desc = params[v]
+                    _desc = project[jira_field]
+                    if desc is None and _desc == "":
+                        continue
+                    if desc != _desc:
+                        if _desc is None:
+                            update_dict[jira_field] = ""
+                        else:
+                            update_dict[jira_field] = params[v]
+                    continue
+
+                if params[v] != project[jira_field]:
+                    update_dict[jira_field] = params[v]
+
+        return update_dict
+
+    def create_data(self, params):
+        data = {}
+        for (v, jira_field) in self.jira_fields():
+            if params[v]:
+                data[jira_field] = params[v]
+        data['assigneeType'] = 'PROJECT_LEAD'
+        return data
+
+    def plan(self, desired):
+        category_ids = {}
+        for params in desired:
+            self.resolve_category(params, category_ids)
+
+        # The key of an archived project cannot be used by a new one.
+        existing = {}
+        query = urlencode({
+            'expand': PROJECT_EXPAND,
+            'includeArchived': 'true',
+        })
+        for project in self.module.fetch(PROJECT_ENDPOINT, query) or []:
+            existing[project['key']] = project
+
+        # Read the schemes of every existing project concurrently.
+        reads = []
+        for params in desired:
+            if params['state'] == 'present' and params['key'] in existing:
+                for field in self.scheme_fields(params):
+                    reads.append((params['key'], field))
+
+        scheme_ids = {}
+        ids = self.module.parallel(lambda r: self.get_scheme_id(*r), reads)
+        for ((key, field), id) in zip(reads, ids):
+            scheme_ids.setdefault(key, {})[field] = id
+
+        plan = []
+        for params in desired:
+            key = params['key']
+            project = existing.get(key)
+            if params['state'] == 'absent':
+                if project is None:
+                    plan.append((key, None, None))
+                else:
+                    plan.append((key, 'deleted', None))
+            elif project is None:
+                plan.append((key, 'created', self.create_data(params)))
+            else:
+                update_dict = self.detect_updates(
+                    params, project, scheme_ids.get(key, {}))
+                if len(update_dict) > 0:
+                    plan.append((key, 'updated', update_dict))
+                else:
+                    plan.append((key, None, None))
+
+        return plan
+
+    def write(self, step):
+        (key, action, data) = step
+        endpoint = "%s/%s" % (PROJECT_ENDPOINT, key)
+        if action == 'created':
+            self.module.fetch(PROJECT_ENDPOINT, data=data, method='POST')
+        if action == 'updated':
+            self.module.fetch(endpoint, data=data, method='PUT')
+        if action == 'deleted':
+            self.module.fetch(endpoint, method='DELETE')
+
+
+class JiraGroupMemberships(JiraResource):
+    """Reconcile the members of Jira groups"""
+
+    required = ['group_name', 'users']
+    noun = 'Group'
+
+    def validate(self, params):
+        if params['exclusive'] and params['state'] != 'present':
+            raise JiraModuleError(
+                "exclusive cannot be used with state absent")
+
+    def diff(self, users, members, exclusive, state):
+        """Return the sorted users to add to and remove from a group.
+
+        Jira usernames are case insensitive, so users are compared to the
+        members by their lower-case names. Members are removed under the
+        name Jira returned for them.
+        """
+        users = dict((u.lower(), u) for u in users)
+        members = dict((m.lower(), m) for m in members)
+        if state == 'absent':
+            return ([], sorted([members[u] for u in users if u in members]))
+
+        removed = []
+        if exclusive:
+            removed = sorted(
+                [members[m] for m in members if m not in users])
+        return (sorted([users[u] for u in users if u not in members]),
+                removed)
+
+    def read_members(self, group_name):
+        try:
+            return self.module.group_members(group_name)
+        except JiraModuleError:
+            # The group may be created by the same run.
+            if self.module.check_mode:
+                return set()
+            raise
+
+    def plan(self, desired):
+        members = self.module.parallel(
+            self.read_members, [params['group_name'] for params in desired])
+
+        plan = []
+        for (params, _members) in zip(desired, members):
+            name = params['group_name']
+            (added, removed) = self.diff(
+                params['users'], _members, params['exclusive'],
+                params['state'])
+
+            action = 'updated'
+            if params['state'] == 'absent':
+                action = 'deleted'
+
+            for user in added:
+                plan.append((name, action, (True, user)))
+            for user in removed:
+                plan.append((name, action, (False, user)))
+            if len(added) == 0 and len(removed) == 0:
+                plan.append((name, None, None))
+
+        return plan
+
+    def write(self, step):
+        (name, action, (add, user)) = step
+        if add:
+            self.module.add_group_member(name, user)
+        else:
+            self.module.remove_group_member(name, user)
+
+
+class JiraProjectRoleMemberships(JiraResource):
+    """Reconcile the users and groups of Jira project roles"""
+
+    required = ['project_key', 'role_name']
+    noun = 'Project role'
+
+    def name(self, params):
+        return "%s/%s" % (params['project_key'], params['role_name'])
+
+    def actor_names(self, actors):
+        """Split the actors of a project role into users and groups."""
+        users = []
+        groups = []
+        for actor in actors.get('actors', []):
+            if actor['type'] == ACTOR_TYPES['user']:
+                users.append(actor['name'])
+            if actor['type'] == ACTOR_TYPES['group']:
+                groups.append(actor['name'])
+        return (users, groups)
+
+    def diff_actors(self, users, groups, _users, _groups, state):
+        """Compute the actors to add to and remove from a role.
+
+        Returns a list of (method, actor type, name) tuples. users or
+        groups set to None are not managed. Jira user and group names are
+        case insensitive, so actors are compared by their lower-case
+        names and removed under the name Jira returned.
+        """
+        changes = []
+        for (actor_type, wanted, current) in [
+                ('user', users, _users), ('group', groups, _groups)]:
+            if state == 'absent':
+                wanted = []
+            if wanted is None:
+                continue
+
+            wanted = dict((name.lower(), name) for name in wanted)
+            current = dict((name.lower(), name) for name in current)
+            for name in sorted(set(wanted) - set(current)):
+                changes.append(('POST', actor_type, wanted[name]))
+            for name in sorted(set(current) - set(wanted)):
+                changes.append(('DELETE', actor_type, current[name]))
+
+        return changes
+
+    def change_requests(self, endpoint, changes):
+        """Turn actor changes into requests.
+
+        All additions go in one request, each removal needs its own.
+        """
+        requests = []
+
+        additions = {}
+        for (method, actor_type, name) in changes:
+            if method == 'POST':
+                additions.setdefault(actor_type, []).append(name)
+            else:
+                query = urlencode({actor_type: name})
+                requests.append((endpoint, 'DELETE', query, None))
+
+        if len(additions) > 0:
+            requests.insert(0, (endpoint, 'POST', None, additions))
+
+        return requests
+
+    def read(self, pairs):
+        """Read the actors of (project key, role name) pairs.
+
+        Returns the endpoint, users and groups of each pair. In check
+        mode, a project or role which does not exist yet may be created by
+        the same run, so it reads as having no actors.
+        """
+        # Every role name resolves through the same cached listing.
+        role_ids = {}
+        for role_name in set([role_name for (prj, role_name) in pairs]):
+            (role_ids[role_name], role) = self.module.read_named(
+                ROLE_ENDPOINT, role_name)
+            if role_ids[role_name] is None and not self.module.check_mode:
+                raise JiraModuleError(
+                    "Unable to determine Jira role id: %s" % (role_name))
+
+        endpoints = []
+        for (prj, role_name) in pairs:
+            endpoint = None
+            if role_ids[role_name] is not None:
+                endpoint = PROJECT_ROLE_ENDPOINT % (prj, role_ids[role_name])
+            endpoints.append(endpoint)
+
+        def read(endpoint):
+            if endpoint is None:
+                return ([], [])
+            actors = self.module.fetch(endpoint)
+            if actors is False:
+                if self.module.check_mode:
+                    return ([], [])
+                raise JiraModuleError(
+                    "Unable to find project role %s" % (endpoint))
+            return self.actor_names(actors)
+
+        current = self.module.parallel(read, endpoints)
+        return [(endpoint, _users, _groups)
+                for (endpoint, (_users, _groups)) in zip(endpoints, current)]
+
+    def plan(self, desired):
+        current = self.read(
+            [(p['project_key'], p['role_name']) for p in desired])
+
+        plan = []
+        for (params, (endpoint, _users, _groups)) in zip(desired, current):
+            name = self.name(params)
+            changes = self.diff_actors(
+                params['users'], params['groups'], _users, _groups,
+                params['state'])
+
+            action = 'updated'
+            if params['state'] == 'absent':
+                action = 'deleted'
+
+            for request in self.change_requests(endpoint, changes):
+                plan.append((name, action, request))
+            if len(changes) == 0:
+                plan.append((name, None, None))
+
+        return plan
+
+    def send(self, request):
+        (endpoint, method, query, data) = request
+        try:
+            self.module.fetch(endpoint, query, data=data, method=method)
+        except JiraModuleError as e:
+            return e.message
+        return None
+
+    def write(self, step):
+        (name, action, (endpoint, method, query, data)) = step
+        self.module.fetch(endpoint, query, data=data, method=method)